@@ -2,11 +2,11 @@
 from .logger import logger, set_conversation_id, set_request_id, get_conversation_id, get_request_id
 from .rbac import User, Role, RBACFilter, set_current_user, get_current_user, get_rbac_filter
 from .circuit_breaker import CircuitBreaker, CircuitState, CircuitBreakerError, circuit_breaker, get_or_create_circuit_breaker
-from .cache import LRUCache, EmbeddingCache, ResponseCache, get_embedding_cache, get_response_cache
+from .cache import LRUCache, EmbeddingCache, ResponseCache, SemanticCache, get_embedding_cache, get_response_cache, get_semantic_cache
 from .hybrid_search import HybridSearch, BM25, SearchResult
 from .reranker import CrossEncoderReranker, LightweightReranker, create_reranker, RerankResult
 from .security import CORSMiddleware, CORSConfig, SecurityHeaders, get_security_headers
-from .rate_limiter import SlidingWindowRateLimiter, TokenBucketRateLimiter, RateLimitResult, get_rate_limiter, check_rate_limit
+from .rate_limiter import SlidingWindowRateLimiter, TokenBucketRateLimiter, RateLimitResult, get_rate_limiter, check_rate_limit, ConcurrencyLimiter, ConcurrencySlot, get_concurrency_limiter
 from .prompt_guard import PromptGuard, ThreatLevel, ScanResult, get_prompt_guard, scan_prompt, is_safe_prompt
 from .auth import APIKeyManager, APIKey, AuthScope, AuthResult, get_key_manager, authenticate, extract_api_key
 
@@ -34,8 +34,10 @@ __all__ = [
     "LRUCache",
     "EmbeddingCache",
     "ResponseCache",
+    "SemanticCache",
     "get_embedding_cache",
     "get_response_cache",
+    "get_semantic_cache",
     # Hybrid Search
     "HybridSearch",
     "BM25",
@@ -56,6 +58,9 @@ __all__ = [
     "RateLimitResult",
     "get_rate_limiter",
     "check_rate_limit",
+    "ConcurrencyLimiter",
+    "ConcurrencySlot",
+    "get_concurrency_limiter",
     # Prompt Guard
     "PromptGuard",
     "ThreatLevel",
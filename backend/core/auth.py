@@ -182,9 +182,12 @@ class APIKeyManager:
         )
 
     def revoke_key(self, key_id: str) -> bool:
-        """Revoga uma API key."""
+        """Revoga uma API key (efeito imediato, inclusive no cache de validação)."""
         if key_id in self._keys:
-            self._keys[key_id].is_active = False
+            api_key = self._keys[key_id]
+            api_key.is_active = False
+            # key_hash é o mesmo SHA-256 do digest do cache, em hex
+            _VALIDATION_CACHE.pop(bytes.fromhex(api_key.key_hash), None)
             return True
         return False
 
@@ -264,19 +267,29 @@ except ImportError:
 
 # Chaves válidas
 VALID_API_KEYS: set[str] = set()
+# Digests SHA-256 das chaves válidas (usados na verificação por request)
+VALID_API_KEY_DIGESTS: set[bytes] = set()
 _AUTH_ENABLED = os.getenv("AUTH_ENABLED", "true").lower() == "true"
 
+
+def _key_digest(key: str) -> bytes:
+    """Digest SHA-256 da chave (comparação sem timing leak do valor em claro)."""
+    return hashlib.sha256(key.encode()).digest()
+
+
 # Carregar API Key do .env ou gerar nova
 _api_key = os.getenv("RAG_API_KEY")
 
 if _api_key:
     # Key encontrada no .env
     VALID_API_KEYS.add(_api_key)
+    VALID_API_KEY_DIGESTS.add(_key_digest(_api_key))
     print(f"[AUTH] API Key carregada do .env: {_api_key[:20]}...")
 else:
     # Gerar nova key
     _api_key = f"rag_{secrets.token_urlsafe(32)}"
     VALID_API_KEYS.add(_api_key)
+    VALID_API_KEY_DIGESTS.add(_key_digest(_api_key))
 
     # Tentar salvar no .env para persistir
     if _DOTENV_AVAILABLE and _env_path:
@@ -292,12 +305,31 @@ else:
         print(f"[AUTH] API Key temporaria (instale python-dotenv para persistir): {_api_key}")
 
 
+# Cache de validações bem-sucedidas: digest -> (expiração em time.monotonic,
+# APIKey do manager ou None para chaves simples). Revogação remove a entrada;
+# a entrada nunca vive além do expires_at da chave.
+_VALIDATION_CACHE: dict[bytes, tuple[float, Optional[APIKey]]] = {}
+_VALIDATION_TTL = 60.0
+_VALIDATION_CACHE_MAX = 10_000
+
+
+def _remember_validation(digest: bytes, api_key: Optional[APIKey] = None) -> None:
+    """Registra validação bem-sucedida no cache (limpa se atingir o limite)."""
+    if len(_VALIDATION_CACHE) >= _VALIDATION_CACHE_MAX:
+        _VALIDATION_CACHE.clear()
+    ttl = _VALIDATION_TTL
+    if api_key is not None and api_key.expires_at is not None:
+        remaining = (api_key.expires_at - datetime.now(timezone.utc)).total_seconds()
+        ttl = min(ttl, remaining)
+    _VALIDATION_CACHE[digest] = (time.monotonic() + ttl, api_key)
+
+
 def is_auth_enabled() -> bool:
     """Verifica se autenticação está habilitada."""
     return _AUTH_ENABLED
 
 
-from fastapi import Header
+from fastapi import Header, HTTPException
 
 async def verify_api_key(
     x_api_key: str = Header(None, alias="X-API-Key"),
@@ -316,8 +348,6 @@ async def verify_api_key(
     Raises:
         HTTPException 401 se inválida
     """
-    from fastapi import HTTPException, Header
-
     # Se auth está desabilitada, retorna placeholder
     if not is_auth_enabled():
         return "auth_disabled"
@@ -339,14 +369,25 @@ async def verify_api_key(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Verificar se é uma chave válida (simples)
-    if key in VALID_API_KEYS:
+    # Validação recente em cache
+    digest = _key_digest(key)
+    cached = _VALIDATION_CACHE.get(digest)
+    if cached is not None and cached[0] > time.monotonic():
+        api_key = cached[1]
+        if api_key is not None:
+            api_key.last_used_at = datetime.now(timezone.utc)
+        return key
+
+    # Verificar se é uma chave válida (simples) pelo digest
+    if digest in VALID_API_KEY_DIGESTS:
+        _remember_validation(digest)
         return key
 
     # Verificar usando o manager (para chaves criadas programaticamente)
     manager = get_key_manager()
     result = manager.authenticate(key)
     if result.authenticated:
+        _remember_validation(digest, result.api_key)
         return key
 
     raise HTTPException(
@@ -359,11 +400,15 @@ async def verify_api_key(
 def add_valid_key(key: str) -> None:
     """Adiciona uma chave válida."""
     VALID_API_KEYS.add(key)
+    VALID_API_KEY_DIGESTS.add(_key_digest(key))
 
 
 def remove_valid_key(key: str) -> None:
     """Remove uma chave válida."""
     VALID_API_KEYS.discard(key)
+    digest = _key_digest(key)
+    VALID_API_KEY_DIGESTS.discard(digest)
+    _VALIDATION_CACHE.pop(digest, None)
 
 
 if __name__ == "__main__":
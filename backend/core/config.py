@@ -11,6 +11,22 @@ from typing import Optional
 from pathlib import Path
 
 
+# Metadados por modelo (montados uma vez, não a cada acesso à property)
+_MODEL_DIMENSIONS = {
+    "BAAI/bge-small-en-v1.5": 384,
+    "BAAI/bge-base-en-v1.5": 768,
+    "BAAI/bge-large-en-v1.5": 1024,
+    # "text-embedding-3-small": 1536,
+    # "text-embedding-3-large": 3072,
+}
+
+_MODEL_SHORT_NAMES = {
+    "BAAI/bge-small-en-v1.5": "bge-small",
+    "BAAI/bge-base-en-v1.5": "bge-base",
+    "BAAI/bge-large-en-v1.5": "bge-large",
+}
+
+
 class EmbeddingModel(str, Enum):
     """Modelos de embedding disponíveis."""
     BGE_SMALL = "BAAI/bge-small-en-v1.5"
@@ -23,24 +39,78 @@ class EmbeddingModel(str, Enum):
     @property
     def dimensions(self) -> int:
         """Retorna dimensionalidade do modelo."""
-        dims = {
-            "BAAI/bge-small-en-v1.5": 384,
-            "BAAI/bge-base-en-v1.5": 768,
-            "BAAI/bge-large-en-v1.5": 1024,
-            # "text-embedding-3-small": 1536,
-            # "text-embedding-3-large": 3072,
-        }
-        return dims.get(self.value, 384)
+        return _MODEL_DIMENSIONS.get(self.value, 384)
 
     @property
     def short_name(self) -> str:
         """Retorna nome curto do modelo."""
-        names = {
-            "BAAI/bge-small-en-v1.5": "bge-small",
-            "BAAI/bge-base-en-v1.5": "bge-base",
-            "BAAI/bge-large-en-v1.5": "bge-large",
-        }
-        return names.get(self.value, "unknown")
+        return _MODEL_SHORT_NAMES.get(self.value, "unknown")
+
+
+# --- Formato dos vetores no sqlite-vec ---
+# int8 ocupa 1 byte por dimensão (384 B no bge-small contra 1536 B em float32):
+# o scan do MATCH lê 4x menos memória. A quantização é feita pelo sqlite-vec
+# (vec_quantize_int8 'unit'), então embeddings e caches seguem em float32.
+
+QUANTIZATION_FLOAT32 = "float32"
+QUANTIZATION_INT8 = "int8"
+QUANTIZATIONS = (QUANTIZATION_FLOAT32, QUANTIZATION_INT8)
+
+# Calibração do modo 'unit': [-1, 1] -> [-128, 127] (BGE é normalizado)
+INT8_UNIT_SCALE = 127.5
+
+
+def vector_column(dimensions: int, quantization: str) -> str:
+    """Tipo da coluna embedding no CREATE VIRTUAL TABLE ... USING vec0."""
+    if quantization == QUANTIZATION_INT8:
+        return f"int8[{dimensions}]"
+    return f"float[{dimensions}]"
+
+
+def vector_param(quantization: str) -> str:
+    """Placeholder SQL para um vetor float32 (INSERT ou MATCH)."""
+    if quantization == QUANTIZATION_INT8:
+        return "vec_quantize_int8(?, 'unit')"
+    return "?"
+
+
+def distance_scale(quantization: str) -> float:
+    """Fator para trazer a distância L2 de volta à escala float."""
+    if quantization == QUANTIZATION_INT8:
+        return INT8_UNIT_SCALE
+    return 1.0
+
+
+# Re-score em dois estágios (int8): o MATCH int8 traz candidatos extras e a
+# distância final é recalculada com o vetor float32 guardado nesta tabela
+RESCORE_TABLE = "vec_documentos_float"
+RESCORE_TABLE_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {RESCORE_TABLE} (
+        doc_id INTEGER PRIMARY KEY,
+        embedding BLOB NOT NULL
+    )
+"""
+
+# Versão dos dados: a ingestão incrementa a cada escrita e os caches de leitura
+# (get_document, list_sources, BM25) comparam com a versão em que leram
+META_TABLE = "rag_meta"
+META_TABLE_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {META_TABLE} (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+"""
+DATA_VERSION_SQL = f"SELECT value FROM {META_TABLE} WHERE key = 'data_version'"
+BUMP_DATA_VERSION_SQL = f"""
+    INSERT INTO {META_TABLE} (key, value) VALUES ('data_version', 1)
+    ON CONFLICT(key) DO UPDATE SET value = value + 1
+"""
+
+
+def bump_data_version(cursor) -> None:
+    """Incrementa a versão dos dados (chamar após escrever documentos/embeddings)."""
+    cursor.execute(META_TABLE_DDL)
+    cursor.execute(BUMP_DATA_VERSION_SQL)
 
 
 class ChunkingStrategy(str, Enum):
@@ -58,6 +128,9 @@ class RAGConfig:
     # --- Embedding Model ---
     embedding_model: EmbeddingModel
     embedding_dimensions: int
+    embedding_quantization: str  # float32 | int8 (formato no vec0)
+    embedding_rescore_factor: int  # int8: candidatos extras para re-score (0 = desliga)
+    ivf_probes: int  # Clusters varridos pelo índice IVF (0 = busca exata)
 
     # --- Database ---
     db_path: Path
@@ -97,6 +170,9 @@ class RAGConfig:
 
         Environment Variables:
             EMBEDDING_MODEL: Nome do modelo (default: bge-large)
+            EMBEDDING_QUANTIZATION: Formato no sqlite-vec, float32 ou int8 (default: float32)
+            EMBEDDING_RESCORE_FACTOR: Com int8, busca k*N candidatos e re-ordena em float32 (default: 4, 0 = desliga)
+            IVF_PROBES: Clusters varridos na busca aproximada, requer scripts/build_ivf_index.py (default: 0 = exata)
             CHUNKING_STRATEGY: Estratégia de chunking (default: semantic)
             CHUNK_SIZE: Tamanho do chunk em tokens (default: 500)
             CHUNK_OVERLAP: Overlap em tokens (default: 50)
@@ -114,6 +190,10 @@ class RAGConfig:
         }
         embedding_model = model_map.get(model_name, EmbeddingModel.BGE_SMALL)
 
+        quantization = os.getenv("EMBEDDING_QUANTIZATION", QUANTIZATION_FLOAT32).lower()
+        if quantization not in QUANTIZATIONS:
+            quantization = QUANTIZATION_FLOAT32
+
         # Chunking
         chunking_strategy_name = os.getenv("CHUNKING_STRATEGY", "semantic")
         chunking_strategy = ChunkingStrategy(chunking_strategy_name)
@@ -126,6 +206,9 @@ class RAGConfig:
             # Embedding
             embedding_model=embedding_model,
             embedding_dimensions=embedding_model.dimensions,
+            embedding_quantization=quantization,
+            embedding_rescore_factor=int(os.getenv("EMBEDDING_RESCORE_FACTOR", "4")),
+            ivf_probes=int(os.getenv("IVF_PROBES", "0")),
 
             # Database
             db_path=db_path,
@@ -159,6 +242,11 @@ class RAGConfig:
             max_concurrent_embeddings=int(os.getenv("MAX_CONCURRENT_EMBEDDINGS", "10")),
         )
 
+    @property
+    def rescore_enabled(self) -> bool:
+        """Re-score float32 ativo (apenas com vetores int8)."""
+        return self.embedding_quantization == QUANTIZATION_INT8 and self.embedding_rescore_factor > 0
+
     def to_dict(self) -> dict:
         """Converte configuração para dict."""
         return {
@@ -166,6 +254,8 @@ class RAGConfig:
                 "model": self.embedding_model.value,
                 "short_name": self.embedding_model.short_name,
                 "dimensions": self.embedding_dimensions,
+                "quantization": self.embedding_quantization,
+                "rescore_factor": self.embedding_rescore_factor if self.rescore_enabled else 0,
             },
             "chunking": {
                 "strategy": self.chunking_strategy.value,
@@ -178,6 +268,7 @@ class RAGConfig:
                 "fetch_k_multiplier": self.fetch_k_multiplier,
                 "vector_weight": self.vector_weight,
                 "bm25_weight": self.bm25_weight,
+                "ivf_probes": self.ivf_probes,
             },
             "adaptive_topk": {
                 "enabled": self.adaptive_topk_enabled,
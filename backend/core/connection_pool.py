@@ -0,0 +1,145 @@
+# =============================================================================
+# CONNECTION POOL - Conexões apsw + sqlite-vec Reutilizáveis
+# =============================================================================
+# Evita abrir conexão e recarregar a extensão sqlite-vec a cada tool call
+# =============================================================================
+
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import apsw
+import sqlite_vec
+
+
+# PRAGMAs aplicados a toda conexão do pool. WAL permite leituras concorrentes
+# com a ingestão; mmap serve os blobs de vetores direto do page cache do SO
+# (sem read() por página no scan do MATCH)
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=1073741824",  # 1 GB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-131072",    # 128 MB
+)
+
+# Espera por locks (troca para WAL, checkpoint durante a ingestão) antes de
+# falhar com BusyError
+BUSY_TIMEOUT_MS = 5000
+
+# PRAGMAs adicionais para conexões somente leitura (tools de busca).
+# Aplicados depois: com query_only=1 o journal_mode não poderia mudar
+READ_PRAGMAS = (
+    "PRAGMA query_only=1",
+)
+
+
+class ConnectionPool:
+    """
+    Pool de conexões apsw com sqlite-vec já carregado.
+
+    As conexões são criadas sob demanda até `size` e devolvidas ao pool
+    ao final de cada uso (não são fechadas entre chamadas).
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        size: int = 4,
+        read_only: bool = True,
+        statement_cache_size: int = 128,
+    ):
+        """
+        Args:
+            db_path: Caminho do banco SQLite
+            size: Número máximo de conexões
+            read_only: Aplica query_only=1 (além dos PRAGMAs de conexão)
+            statement_cache_size: Statements preparados mantidos por conexão
+        """
+        self.db_path = str(db_path)
+        self.size = size
+        self.read_only = read_only
+        self.statement_cache_size = statement_cache_size
+        self._idle: queue.Queue = queue.Queue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> apsw.Connection:
+        """Abre nova conexão com sqlite-vec e PRAGMAs aplicados."""
+        conn = apsw.Connection(self.db_path, statementcachesize=self.statement_cache_size)
+        conn.setbusytimeout(BUSY_TIMEOUT_MS)
+        conn.enableloadextension(True)
+        conn.loadextension(sqlite_vec.loadable_path())
+        conn.enableloadextension(False)
+
+        cursor = conn.cursor()
+        for pragma in CONNECTION_PRAGMAS:
+            cursor.execute(pragma)
+
+        if self.read_only:
+            for pragma in READ_PRAGMAS:
+                cursor.execute(pragma)
+
+        return conn
+
+    def _get(self) -> apsw.Connection:
+        """Obtém conexão ociosa, cria uma nova ou aguarda devolução."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._created -= 1
+                    raise
+
+        return self._idle.get()
+
+    @contextmanager
+    def acquire(self) -> Iterator[apsw.Connection]:
+        """
+        Empresta uma conexão do pool.
+
+        Usage:
+            with pool.acquire() as conn:
+                conn.cursor().execute(...)
+        """
+        conn = self._get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close_all(self) -> None:
+        """Fecha as conexões ociosas."""
+        with self._lock:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                conn.close()
+                self._created -= 1
+
+
+# Instâncias globais (uma por banco)
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: Union[str, Path], size: int = 4) -> ConnectionPool:
+    """Retorna pool global (somente leitura) para o banco informado."""
+    key = str(db_path)
+    with _pools_lock:
+        pool: Optional[ConnectionPool] = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(key, size=size)
+            _pools[key] = pool
+        return pool
@@ -0,0 +1,56 @@
+# =============================================================================
+# EMBEDDING MODEL - Modelo FastEmbed Pré-carregado
+# =============================================================================
+# Sessão ONNX com threads intra-op ajustadas e warmup no carregamento, para
+# que a primeira query não pague a otimização do grafo
+# =============================================================================
+
+import os
+from typing import Optional
+
+from fastembed import TextEmbedding
+
+from core.config import get_config
+
+
+def load_embedding_model(
+    model_name: Optional[str] = None,
+    threads: Optional[int] = None,
+    warmup: bool = True,
+) -> TextEmbedding:
+    """
+    Carrega modelo FastEmbed na CPU.
+
+    Args:
+        model_name: Modelo (None = usar config)
+        threads: Threads intra-op do ONNX Runtime (None = EMBEDDING_THREADS ou nº de CPUs)
+        warmup: Executa um embed de aquecimento
+
+    Returns:
+        Instância de TextEmbedding pronta para uso
+    """
+    model_name = model_name or get_config().embedding_model.value
+    threads = threads or int(os.getenv("EMBEDDING_THREADS", "0")) or os.cpu_count()
+
+    model = TextEmbedding(
+        model_name,
+        threads=threads,
+        providers=["CPUExecutionProvider"],
+    )
+
+    if warmup:
+        list(model.embed(["warmup"]))
+
+    return model
+
+
+# Instância global
+_model: Optional[TextEmbedding] = None
+
+
+def get_embedding_model() -> TextEmbedding:
+    """Retorna modelo global (carregado e aquecido na primeira chamada)."""
+    global _model
+    if _model is None:
+        _model = load_embedding_model()
+    return _model
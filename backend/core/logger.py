@@ -2,15 +2,20 @@
 # LOGGER - Logging JSON Estruturado para RAG Agent
 # =============================================================================
 # Logs em formato JSON com campos padronizados para observabilidade
+# Emissão não-bloqueante: QueueHandler no hot path, formatação/IO em thread
+# dedicada (QueueListener)
 # =============================================================================
 
+import atexit
 import json
 import logging
+import queue
 import sys
 import uuid
 from datetime import datetime, timezone
 from typing import Any, Optional
 from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
 
 # Context var para rastrear conversation_id entre chamadas
 conversation_id_var: ContextVar[str] = ContextVar("conversation_id", default="")
@@ -18,18 +23,37 @@ request_id_var: ContextVar[str] = ContextVar("request_id", default="")
 session_id_var: ContextVar[str] = ContextVar("session_id", default="")
 
 
+def _current_context() -> tuple[str, str, str]:
+    """Snapshot dos context vars (conversation, request, session)."""
+    return conversation_id_var.get(), request_id_var.get(), session_id_var.get()
+
+
+class _EnqueueHandler(QueueHandler):
+    """
+    QueueHandler sem prepare(): o record vai para a fila como está.
+
+    Os records são criados por RAGLogger e não são mutados depois, então
+    não é preciso copiar/pré-formatar no hot path.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
 class JSONFormatter(logging.Formatter):
     """Formatter que gera logs em JSON estruturado."""
 
     def format(self, record: logging.LogRecord) -> str:
+        # Contexto capturado na emissão (o formatter roda na thread do listener)
+        context = getattr(record, "context", None) or _current_context()
         log_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
-            "conversation_id": conversation_id_var.get() or None,
-            "request_id": request_id_var.get() or None,
-            "session_id": session_id_var.get() or None,
+            "conversation_id": context[0] or None,
+            "request_id": context[1] or None,
+            "session_id": context[2] or None,
         }
 
         # Adicionar campos extras se existirem
@@ -56,12 +80,25 @@ class RAGLogger:
     def __init__(self, name: str = "rag-agent"):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.DEBUG)
+        self._listener: Optional[QueueListener] = None
 
         # Evitar handlers duplicados
         if not self.logger.handlers:
             handler = logging.StreamHandler(sys.stdout)
             handler.setFormatter(JSONFormatter())
-            self.logger.addHandler(handler)
+
+            # Hot path faz apenas put_nowait; JSON + write na thread do listener
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            self.logger.addHandler(_EnqueueHandler(log_queue))
+            self._listener = QueueListener(log_queue, handler)
+            self._listener.start()
+            atexit.register(self.flush)
+
+    def flush(self) -> None:
+        """Drena a fila e para a thread do listener."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
 
     def _log(
         self,
@@ -80,6 +117,7 @@ class RAGLogger:
             exc_info=None,
         )
         record.extra_fields = extra_fields
+        record.context = _current_context()
         self.logger.handle(record)
 
     def debug(self, message: str, **extra: Any) -> None:
@@ -135,6 +173,28 @@ class RAGLogger:
             **extra,
         )
 
+    def log_search(
+        self,
+        query: str,
+        top_k: int,
+        doc_ids: list[int],
+        similarities: list[float],
+        latency_ns: int,
+        **extra: Any,
+    ) -> None:
+        """Log de busca + documentos recuperados em um único evento."""
+        self.info(
+            "semantic_search",
+            event_type="query",
+            query=query[:200],  # Truncar queries longas
+            top_k=top_k,
+            results_count=len(doc_ids),
+            doc_ids=doc_ids,
+            similarities=[round(s, 3) for s in similarities],
+            latency_ms=latency_ns // 1000 / 1000,
+            **extra,
+        )
+
     def log_llm_call(
         self,
         model: str,
@@ -243,6 +303,7 @@ if __name__ == "__main__":
     logger.info("Sistema iniciado", version="1.0.0")
     logger.log_query("politica de IA", top_k=5, results_count=3, latency_ms=150.5)
     logger.log_retrieval([1, 2, 3], [0.95, 0.87, 0.72], latency_ms=50.2)
+    logger.log_search("politica de IA", 5, [1, 2, 3], [0.95, 0.87, 0.72], latency_ns=150_500_000)
     logger.log_llm_call("claude-haiku-4-5", 500, 200, latency_ms=1200.0, cost_usd=0.0005)
     logger.log_rbac("user@email.com", "read", "doc:123", allowed=True)
     logger.log_error("ValidationError", "Campo obrigatório ausente")
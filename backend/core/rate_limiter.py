@@ -4,9 +4,12 @@
 # Implementa sliding window rate limiting para proteger contra abuso
 # =============================================================================
 
+import os
 import time
 import threading
-from collections import defaultdict
+import functools
+import inspect
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from typing import Optional
 
@@ -43,17 +46,21 @@ class SlidingWindowRateLimiter:
     Rate limiter com janela deslizante.
 
     Mais preciso que fixed window, evita bursts no limite da janela.
+    Cada janela (minuto/hora) é um deque ordenado por timestamp: a expiração
+    remove do início (popleft) e a contagem é len(), sem reconstruir listas.
     """
 
     def __init__(self, config: Optional[RateLimitConfig] = None):
         self.config = config or RateLimitConfig()
-        self._requests: dict[str, list[float]] = defaultdict(list)
+        self._minute: dict[str, deque[float]] = defaultdict(deque)
+        self._hour: dict[str, deque[float]] = defaultdict(deque)
         self._lock = threading.RLock()
 
-    def _cleanup_old_requests(self, key: str, window_seconds: int) -> None:
-        """Remove requisições antigas da janela."""
-        cutoff = time.time() - window_seconds
-        self._requests[key] = [t for t in self._requests[key] if t > cutoff]
+    @staticmethod
+    def _evict(window: deque[float], cutoff: float) -> None:
+        """Remove timestamps fora da janela."""
+        while window and window[0] <= cutoff:
+            window.popleft()
 
     def check(self, key: str) -> RateLimitResult:
         """
@@ -68,18 +75,17 @@ class SlidingWindowRateLimiter:
         with self._lock:
             now = time.time()
 
-            # Limpar requisições antigas (janela de 1 hora)
-            self._cleanup_old_requests(key, 3600)
-
-            requests = self._requests[key]
+            minute = self._minute[key]
+            hour = self._hour[key]
+            self._evict(minute, now - 60)
+            self._evict(hour, now - 3600)
 
             # Verificar limite por minuto
-            minute_ago = now - 60
-            requests_last_minute = sum(1 for t in requests if t > minute_ago)
+            requests_last_minute = len(minute)
 
             if requests_last_minute >= self.config.requests_per_minute:
                 # Calcular quando poderá tentar novamente
-                oldest_in_minute = min((t for t in requests if t > minute_ago), default=now)
+                oldest_in_minute = minute[0]
                 retry_after = int(60 - (now - oldest_in_minute)) + 1
 
                 return RateLimitResult(
@@ -90,11 +96,10 @@ class SlidingWindowRateLimiter:
                 )
 
             # Verificar limite por hora
-            hour_ago = now - 3600
-            requests_last_hour = sum(1 for t in requests if t > hour_ago)
+            requests_last_hour = len(hour)
 
             if requests_last_hour >= self.config.requests_per_hour:
-                oldest_in_hour = min((t for t in requests if t > hour_ago), default=now)
+                oldest_in_hour = hour[0]
                 retry_after = int(3600 - (now - oldest_in_hour)) + 1
 
                 return RateLimitResult(
@@ -105,7 +110,8 @@ class SlidingWindowRateLimiter:
                 )
 
             # Permitido - registrar requisição
-            requests.append(now)
+            minute.append(now)
+            hour.append(now)
 
             remaining = min(
                 self.config.requests_per_minute - requests_last_minute - 1,
@@ -121,21 +127,23 @@ class SlidingWindowRateLimiter:
     def reset(self, key: str) -> None:
         """Reseta contadores para uma chave."""
         with self._lock:
-            if key in self._requests:
-                del self._requests[key]
+            self._minute.pop(key, None)
+            self._hour.pop(key, None)
 
     def get_stats(self, key: str) -> dict:
         """Retorna estatísticas para uma chave."""
         with self._lock:
             now = time.time()
-            requests = self._requests.get(key, [])
-
-            minute_ago = now - 60
-            hour_ago = now - 3600
+            minute = self._minute.get(key)
+            hour = self._hour.get(key)
+            if minute is not None:
+                self._evict(minute, now - 60)
+            if hour is not None:
+                self._evict(hour, now - 3600)
 
             return {
-                "requests_last_minute": sum(1 for t in requests if t > minute_ago),
-                "requests_last_hour": sum(1 for t in requests if t > hour_ago),
+                "requests_last_minute": len(minute) if minute is not None else 0,
+                "requests_last_hour": len(hour) if hour is not None else 0,
                 "limit_per_minute": self.config.requests_per_minute,
                 "limit_per_hour": self.config.requests_per_hour,
             }
@@ -226,10 +234,184 @@ def check_rate_limit(key: str) -> RateLimitResult:
     return get_rate_limiter().check(key)
 
 
+_PERIOD_SECONDS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_limit(limit_string: str) -> tuple[int, int]:
+    """Converte "30/minute" em (30, 60). Cacheado: poucas strings distintas."""
+    count, _, period = limit_string.partition("/")
+    return int(count), _PERIOD_SECONDS[period.strip().rstrip("s")]
+
+
+class SimpleLimiter:
+    """
+    Limiter de fallback compatível com a API de decorator do slowapi.
+
+    Usa um token bucket por (IP, endpoint): memória O(1) por chave e uma
+    única atualização de (tokens, último refill) por requisição. Os buckets
+    são divididos em shards, cada um com seu lock, para reduzir contenção.
+    """
+
+    SHARDS = 16  # Potência de 2 (shard = hash & (SHARDS - 1))
+
+    def __init__(self):
+        # Por shard: key -> (tokens, last_refill)
+        self._buckets: list[dict[str, tuple[float, float]]] = [{} for _ in range(self.SHARDS)]
+        self._locks = [threading.Lock() for _ in range(self.SHARDS)]
+
+    def consume(self, key: str, capacity: int, period: int) -> float:
+        """
+        Consome um token do bucket.
+
+        Returns:
+            0.0 se permitido, senão segundos até o próximo token
+        """
+        rate = capacity / period
+        now = time.monotonic()
+        shard = hash(key) & (self.SHARDS - 1)
+        buckets = self._buckets[shard]
+        with self._locks[shard]:
+            tokens, last_refill = buckets.get(key, (float(capacity), now))
+            tokens = min(capacity, tokens + (now - last_refill) * rate)
+            if tokens >= 1.0:
+                buckets[key] = (tokens - 1.0, now)
+                return 0.0
+            buckets[key] = (tokens, now)
+        return (1.0 - tokens) / rate
+
+    def limit(self, limit_string: str):
+        """Decorator de endpoint: @limiter.limit("30/minute")."""
+        from fastapi import HTTPException
+
+        capacity, period = _parse_limit(limit_string)
+
+        def decorator(func):
+            endpoint = func.__name__
+
+            def _check(args, kwargs):
+                request = kwargs.get("request")
+                if request is None:
+                    request = next((a for a in args if hasattr(a, "headers")), None)
+                if request is None:
+                    return
+                wait = self.consume(f"{get_client_ip(request)}:{endpoint}", capacity, period)
+                if wait:
+                    raise HTTPException(
+                        status_code=429,
+                        detail=f"Rate limit exceeded: {limit_string}",
+                        headers={"Retry-After": str(int(wait) + 1)},
+                    )
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    _check(args, kwargs)
+                    return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                _check(args, kwargs)
+                return func(*args, **kwargs)
+            return sync_wrapper
+
+        return decorator
+
+
+# Instância global do fallback
+_simple_limiter: Optional[SimpleLimiter] = None
+
+
+def get_simple_limiter() -> SimpleLimiter:
+    """Retorna limiter de fallback global."""
+    global _simple_limiter
+    if _simple_limiter is None:
+        _simple_limiter = SimpleLimiter()
+    return _simple_limiter
+
+
+class ConcurrencyLimiter:
+    """
+    Limita requisições simultâneas por chave (IP).
+
+    Complementa o limite por taxa: um mesmo cliente não consegue manter
+    vários streams abertos e monopolizar a sessão única do Claude SDK.
+    """
+
+    def __init__(self, max_concurrent: int = 2):
+        self.max_concurrent = max_concurrent
+        self._active: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> bool:
+        """Ocupa uma vaga para a chave; False se já está no limite."""
+        with self._lock:
+            active = self._active.get(key, 0)
+            if active >= self.max_concurrent:
+                return False
+            self._active[key] = active + 1
+            return True
+
+    def release(self, key: str) -> None:
+        """Libera a vaga ocupada por acquire()."""
+        with self._lock:
+            active = self._active.get(key, 0) - 1
+            if active > 0:
+                self._active[key] = active
+            else:
+                self._active.pop(key, None)
+
+    def active(self, key: str) -> int:
+        """Requisições em andamento para a chave."""
+        return self._active.get(key, 0)
+
+    def slot(self, key: str) -> Optional["ConcurrencySlot"]:
+        """Ocupa uma vaga e a retorna; None se já está no limite."""
+        if not self.acquire(key):
+            return None
+        return ConcurrencySlot(self, key)
+
+
+class ConcurrencySlot:
+    """
+    Vaga ocupada em um ConcurrencyLimiter.
+
+    release() é idempotente: pode ser chamado por todos os caminhos de saída
+    (gerador do stream, resposta, tratamento de erro) sem liberar duas vezes.
+    """
+
+    def __init__(self, limiter: ConcurrencyLimiter, key: str):
+        self.key = key
+        self._limiter = limiter
+        self._released = False
+
+    def release(self) -> None:
+        """Libera a vaga (apenas na primeira chamada)."""
+        if not self._released:
+            self._released = True
+            self._limiter.release(self.key)
+
+
+# Máximo de requisições de chat simultâneas por IP
+MAX_CONCURRENT_PER_IP = int(os.getenv("MAX_CONCURRENT_PER_IP", "2"))
+
+# Instância global
+_concurrency_limiter: Optional[ConcurrencyLimiter] = None
+
+
+def get_concurrency_limiter() -> ConcurrencyLimiter:
+    """Retorna limiter de concorrência global."""
+    global _concurrency_limiter
+    if _concurrency_limiter is None:
+        _concurrency_limiter = ConcurrencyLimiter(MAX_CONCURRENT_PER_IP)
+    return _concurrency_limiter
+
+
 # Aliases para compatibilidade com server.py
 def get_limiter():
     """Retorna limiter para uso com decorator (compatível com slowapi)."""
-    return get_rate_limiter()
+    return get_simple_limiter()
 
 
 # Tenta usar slowapi se disponível
@@ -254,13 +436,16 @@ RATE_LIMITS = {
     "default": "60/minute",
 }
 
+# Versão já convertida: nome -> (requisições, janela em segundos)
+RATE_LIMITS_PARSED = {name: _parse_limit(limit) for name, limit in RATE_LIMITS.items()}
+
 
 def get_client_ip(request) -> str:
     """Extrai IP do cliente da requisição."""
     # Tentar headers de proxy reverso
     forwarded = request.headers.get("X-Forwarded-For")
     if forwarded:
-        return forwarded.split(",")[0].strip()
+        return forwarded.partition(",")[0].strip()
 
     real_ip = request.headers.get("X-Real-IP")
     if real_ip:
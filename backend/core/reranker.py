@@ -4,12 +4,13 @@
 # Melhora a precisão reordenando candidatos com modelo cross-encoder
 # =============================================================================
 
+import heapq
 from dataclasses import dataclass
 from typing import Optional
 import time
 
 
-@dataclass
+@dataclass(slots=True)
 class RerankResult:
     """Resultado após re-ranking."""
     doc_id: int
@@ -156,26 +157,27 @@ class LightweightReranker:
 
         query_lower = query.lower()
         query_terms = [t for t in query_lower.split() if len(t) > 2]
+        coverage_factor = self.term_coverage_weight / max(len(query_terms), 1)
 
         results = []
         for doc_id, content, original_score, metadata in documents:
             content_lower = content.lower()
+            inv_len = 0.1 / max(len(content_lower), 1)
 
             # 1. Match exato da query
             exact_match = self.exact_match_weight if query_lower in content_lower else 0
 
-            # 2. Cobertura de termos
-            matched_terms = sum(1 for term in query_terms if term in content_lower)
-            term_coverage = (matched_terms / max(len(query_terms), 1)) * self.term_coverage_weight
-
-            # 3. Posição dos termos (termos no início = mais relevante)
+            # 2 e 3. Cobertura e posição dos termos: um único find() por termo
+            # (termos no início = mais relevante)
+            matched_terms = 0
             position_score = 0
             for term in query_terms:
                 pos = content_lower.find(term)
                 if pos >= 0:
-                    # Score maior para termos no início
-                    position_score += (1 - pos / max(len(content_lower), 1)) * 0.1
+                    matched_terms += 1
+                    position_score += 0.1 - pos * inv_len
 
+            term_coverage = matched_terms * coverage_factor
             position_score = min(position_score, self.position_weight)
 
             # Score final
@@ -190,14 +192,14 @@ class LightweightReranker:
                 metadata=metadata,
             ))
 
-        # Ordenar por rerank_score
-        results.sort(key=lambda x: x.rerank_score, reverse=True)
+        # Top-k por rerank_score (sem ordenar a lista inteira)
+        top = heapq.nlargest(top_k, results, key=lambda x: x.rerank_score)
 
         # Atribuir ranks
-        for i, r in enumerate(results[:top_k]):
+        for i, r in enumerate(top):
             r.final_rank = i + 1
 
-        return results[:top_k]
+        return top
 
 
 # Factory para criar reranker apropriado
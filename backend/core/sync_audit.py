@@ -11,9 +11,10 @@ import os
 import time
 import json
 import functools
+import reprlib
 import threading
 import queue
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Union
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -23,15 +24,23 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from core.logger import logger
 
+# repr limitado: strings, listas e dicts grandes saem truncados sem
+# materializar o str() completo
+_PARAM_REPR = reprlib.Repr()
+_PARAM_REPR.maxstring = 200
+_PARAM_REPR.maxother = 200
+_PARAM_REPR.maxlist = 10
+_PARAM_REPR.maxdict = 10
+
 
 @dataclass
 class ToolCallRecord:
     """Registro de uma tool call."""
     tool_name: str
-    started_at: int
-    completed_at: int
-    duration_ms: int
-    parameters: dict
+    started_at: float  # wall-clock (epoch, segundos)
+    completed_at: float
+    duration_ms: float  # medido com perf_counter_ns (monotonico)
+    parameters: Union[dict, Callable[[], dict]]  # callable = serializacao adiada
     result: Optional[Any] = None
     error: Optional[str] = None
     session_id: Optional[str] = None
@@ -130,6 +139,10 @@ class SyncAuditQueue:
             return
 
         try:
+            # Parametros serializados aqui, fora da thread da tool
+            if callable(record.parameters):
+                record.parameters = record.parameters()
+
             with open(self._audit_file, 'a') as f:
                 f.write(json.dumps(asdict(record)) + '\n')
             self._records.append(record)
@@ -138,16 +151,18 @@ class SyncAuditQueue:
 
     def record(self,
                tool_name: str,
-               started_at: int,
-               completed_at: int,
-               parameters: dict,
+               started_at: float,
+               completed_at: float,
+               parameters: Union[dict, Callable[[], dict]],
                result: Optional[Any] = None,
-               error: Optional[str] = None):
+               error: Optional[str] = None,
+               duration_ms: Optional[float] = None):
         """
         Enfileira um registro de tool call.
         Non-blocking - retorna imediatamente.
         """
-        duration_ms = (completed_at - started_at) * 1000
+        if duration_ms is None:
+            duration_ms = (completed_at - started_at) * 1000
 
         record = ToolCallRecord(
             tool_name=tool_name,
@@ -246,28 +261,34 @@ def audit_sync_tool(tool_name: str):
             except:
                 return "[not serializable]"
 
-        def _get_parameters(*args, **kwargs):
+        def _get_parameters(args, kwargs) -> Callable[[], dict]:
             """Captura parametros de forma segura"""
-            return {
-                "args": [str(arg)[:200] for arg in args] if args else [],
-                "kwargs": {k: str(v)[:200] for k, v in kwargs.items()} if kwargs else {}
-            }
+            # Serializacao adiada: executada pelo worker ao persistir
+            def serialize() -> dict:
+                return {
+                    "args": [_PARAM_REPR.repr(arg) for arg in args],
+                    "kwargs": {k: _PARAM_REPR.repr(v) for k, v in kwargs.items()},
+                }
+            return serialize
 
         # Wrapper async para funcoes assincronas
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
             audit = get_audit_queue()
-            start_time = int(time.time())
-            parameters = _get_parameters(*args, **kwargs)
+            start_time = time.time()
+            start_ns = time.perf_counter_ns()
+            parameters = _get_parameters(args, kwargs)
 
             try:
                 result = await func(*args, **kwargs)
-                end_time = int(time.time())
+                end_time = time.time()
+                duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
                 audit.record(
                     tool_name=tool_name,
                     started_at=start_time,
                     completed_at=end_time,
+                    duration_ms=duration_ms,
                     parameters=parameters,
                     result=_serialize_result(result)
                 )
@@ -275,11 +296,13 @@ def audit_sync_tool(tool_name: str):
                 return result
 
             except Exception as e:
-                end_time = int(time.time())
+                end_time = time.time()
+                duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
                 audit.record(
                     tool_name=tool_name,
                     started_at=start_time,
                     completed_at=end_time,
+                    duration_ms=duration_ms,
                     parameters=parameters,
                     error=str(e)
                 )
@@ -289,17 +312,20 @@ def audit_sync_tool(tool_name: str):
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
             audit = get_audit_queue()
-            start_time = int(time.time())
-            parameters = _get_parameters(*args, **kwargs)
+            start_time = time.time()
+            start_ns = time.perf_counter_ns()
+            parameters = _get_parameters(args, kwargs)
 
             try:
                 result = func(*args, **kwargs)
-                end_time = int(time.time())
+                end_time = time.time()
+                duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
                 audit.record(
                     tool_name=tool_name,
                     started_at=start_time,
                     completed_at=end_time,
+                    duration_ms=duration_ms,
                     parameters=parameters,
                     result=_serialize_result(result)
                 )
@@ -307,11 +333,13 @@ def audit_sync_tool(tool_name: str):
                 return result
 
             except Exception as e:
-                end_time = int(time.time())
+                end_time = time.time()
+                duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
                 audit.record(
                     tool_name=tool_name,
                     started_at=start_time,
                     completed_at=end_time,
+                    duration_ms=duration_ms,
                     parameters=parameters,
                     error=str(e)
                 )
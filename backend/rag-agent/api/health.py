@@ -56,9 +56,16 @@ class HealthReport:
 class HealthChecker:
     """Verificador de saúde do sistema."""
 
-    def __init__(self, db_path: str, start_time: Optional[datetime] = None):
+    def __init__(self, db_path: str, start_time: Optional[datetime] = None, model=None):
+        """
+        Args:
+            db_path: Caminho do banco
+            start_time: Início do processo (para uptime)
+            model: TextEmbedding já carregado (evita recarregar o ONNX a cada check)
+        """
         self.db_path = db_path
         self.start_time = start_time or datetime.now(timezone.utc)
+        self._model = model
 
         # SLO targets
         self.slo_targets = {
@@ -69,6 +76,13 @@ class HealthChecker:
             "throughput_rps": 10,            # > 10 req/s capacity
         }
 
+    def _get_model(self):
+        """Retorna modelo de embeddings, carregando uma única vez."""
+        if self._model is None:
+            from core.embedding_model import get_embedding_model
+            self._model = get_embedding_model()
+        return self._model
+
     def check_database(self) -> ComponentHealth:
         """Verifica saúde do banco de dados."""
         start = time.perf_counter()
@@ -92,7 +106,7 @@ class HealthChecker:
             vec_count = 0
             for row in cursor.execute("SELECT COUNT(*) FROM documentos"):
                 doc_count = row[0]
-            for row in cursor.execute("SELECT COUNT(*) FROM vec_documentos"):
+            for row in cursor.execute("SELECT COUNT(*) FROM vec_documentos_rowids"):
                 vec_count = row[0]
 
             conn.close()
@@ -138,10 +152,7 @@ class HealthChecker:
         """Verifica saúde do modelo de embeddings."""
         start = time.perf_counter()
         try:
-            from fastembed import TextEmbedding
-
-            model = TextEmbedding("BAAI/bge-small-en-v1.5")
-            embeddings = list(model.embed(["health check test"]))
+            embeddings = list(self._get_model().embed(["health check test"]))
 
             latency = (time.perf_counter() - start) * 1000
 
@@ -182,11 +193,10 @@ class HealthChecker:
         """Verifica saúde da busca vetorial."""
         start = time.perf_counter()
         try:
-            from fastembed import TextEmbedding
+            from core.config import get_config, vector_param
 
-            model = TextEmbedding("BAAI/bge-small-en-v1.5")
-            embeddings = list(model.embed(["test query"]))
-            query_vec = sqlite_vec.serialize_float32(embeddings[0].tolist())
+            embeddings = list(self._get_model().embed(["test query"]))
+            query_vec = embeddings[0].astype("float32", copy=False).tobytes()
 
             conn = apsw.Connection(self.db_path)
             conn.enableloadextension(True)
@@ -195,10 +205,10 @@ class HealthChecker:
             cursor = conn.cursor()
 
             results = []
-            for row in cursor.execute("""
+            for row in cursor.execute(f"""
                 SELECT v.doc_id, v.distance
                 FROM vec_documentos v
-                WHERE v.embedding MATCH ? AND k = 1
+                WHERE v.embedding MATCH {vector_param(get_config().embedding_quantization)} AND k = 1
             """, (query_vec,)):
                 results.append(row)
 
@@ -4,6 +4,8 @@
 # Métricas de latência, custo, erros e uso do sistema
 # =============================================================================
 
+import math
+import statistics
 import time
 from collections import defaultdict
 from dataclasses import dataclass, field
@@ -12,6 +14,30 @@ from threading import Lock
 from typing import Optional
 import json
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _summarize(values: list[float]) -> tuple[list[float], float, float]:
+    """
+    Ordena uma única vez e agrega soma/média sem passes extras em Python.
+
+    Com numpy: sort + sum vetorizados sobre um único array float64.
+    Sem numpy: sorted() + math.fsum/statistics.fmean.
+
+    Returns:
+        (valores ordenados, soma, média)
+    """
+    if np is not None:
+        arr = np.sort(np.asarray(values, dtype=np.float64))
+        total = float(arr.sum())
+        return arr.tolist(), total, total / arr.size
+
+    sorted_values = sorted(values)
+    return sorted_values, math.fsum(sorted_values), statistics.fmean(sorted_values)
+
 
 @dataclass
 class MetricPoint:
@@ -89,13 +115,13 @@ class MetricsCollector:
             if not values:
                 return {"count": 0, "min": 0, "max": 0, "avg": 0, "p50": 0, "p95": 0, "p99": 0}
 
-            sorted_values = sorted(values)
+            sorted_values, _, avg = _summarize(values)
             n = len(sorted_values)
             return {
                 "count": n,
                 "min": sorted_values[0],
                 "max": sorted_values[-1],
-                "avg": sum(values) / n,
+                "avg": avg,
                 "p50": sorted_values[int(n * 0.5)],
                 "p95": sorted_values[int(n * 0.95)] if n > 20 else sorted_values[-1],
                 "p99": sorted_values[int(n * 0.99)] if n > 100 else sorted_values[-1],
@@ -213,7 +239,7 @@ class MetricsCollector:
                 if values:
                     stats = self._calculate_stats(values)
                     lines.append(f"{name}_count{label_str} {stats['count']}")
-                    lines.append(f"{name}_sum{label_str} {sum(values):.2f}")
+                    lines.append(f"{name}_sum{label_str} {stats['sum']:.2f}")
                     lines.append(f"{name}_avg{label_str} {stats['avg']:.2f}")
                     lines.append(f"{name}_p95{label_str} {stats['p95']:.2f}")
 
@@ -256,15 +282,16 @@ class MetricsCollector:
     def _calculate_stats(self, values: list[float]) -> dict:
         """Calcula estatísticas de uma lista de valores."""
         if not values:
-            return {"count": 0, "min": 0, "max": 0, "avg": 0, "p50": 0, "p95": 0, "p99": 0}
+            return {"count": 0, "sum": 0, "min": 0, "max": 0, "avg": 0, "p50": 0, "p95": 0, "p99": 0}
 
-        sorted_values = sorted(values)
+        sorted_values, total, avg = _summarize(values)
         n = len(sorted_values)
         return {
             "count": n,
+            "sum": round(total, 2),
             "min": round(sorted_values[0], 2),
             "max": round(sorted_values[-1], 2),
-            "avg": round(sum(values) / n, 2),
+            "avg": round(avg, 2),
             "p50": round(sorted_values[int(n * 0.5)], 2),
             "p95": round(sorted_values[min(int(n * 0.95), n - 1)], 2),
             "p99": round(sorted_values[min(int(n * 0.99), n - 1)], 2),
@@ -2,7 +2,7 @@
 from .logger import logger, set_conversation_id, set_request_id, get_conversation_id, get_request_id
 from .rbac import User, Role, RBACFilter, set_current_user, get_current_user, get_rbac_filter
 from .circuit_breaker import CircuitBreaker, CircuitState, CircuitBreakerError, circuit_breaker, get_or_create_circuit_breaker
-from .cache import LRUCache, EmbeddingCache, ResponseCache, get_embedding_cache, get_response_cache
+from .cache import LRUCache, EmbeddingCache, ResponseCache, SemanticCache, get_embedding_cache, get_response_cache, get_semantic_cache
 from .hybrid_search import HybridSearch, BM25, SearchResult
 from .reranker import CrossEncoderReranker, LightweightReranker, create_reranker, RerankResult
 from .security import CORSMiddleware, CORSConfig, SecurityHeaders, get_security_headers
@@ -34,8 +34,10 @@ __all__ = [
     "LRUCache",
     "EmbeddingCache",
     "ResponseCache",
+    "SemanticCache",
     "get_embedding_cache",
     "get_response_cache",
+    "get_semantic_cache",
     # Hybrid Search
     "HybridSearch",
     "BM25",
@@ -14,7 +14,7 @@ class SearchResultProtocol(Protocol):
     similarity: float
 
 
-@dataclass
+@dataclass(slots=True)
 class AdaptiveDecision:
     """Decisão do top-k adaptativo."""
     original_k: int
@@ -11,15 +11,38 @@ import time
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Optional, TypeVar, Generic, Callable
+from typing import Any, Optional, TypeVar, Generic, Callable, Union
+
+# numpy é necessário apenas para o SemanticCache
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# xxhash (opcional): chaves int de 64 bits, sem hexdigest por chamada
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
 
 T = TypeVar('T')
 
+# Chave int (xxh3) ou str (fallback hashlib)
+CacheKey = Union[str, int]
+
+
+def hash_key(content: str) -> CacheKey:
+    """Hash de chave de cache: xxh3_64 se disponível, senão blake2b."""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(content.encode('utf-8'))
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
 
 @dataclass
 class CacheEntry(Generic[T]):
     """Entrada do cache."""
-    key: str
+    key: CacheKey
     value: T
     created_at: datetime
     accessed_at: datetime
@@ -70,18 +93,20 @@ class LRUCache(Generic[T]):
     ):
         self.max_size = max_size
         self.default_ttl = default_ttl
-        self._cache: OrderedDict[str, CacheEntry[T]] = OrderedDict()
+        self._cache: OrderedDict[CacheKey, CacheEntry[T]] = OrderedDict()
         self._lock = threading.RLock()
         self._stats = CacheStats(max_size=max_size)
 
     def _estimate_size(self, value: Any) -> int:
         """Estima tamanho em bytes de um valor."""
+        if isinstance(value, (bytes, bytearray)):
+            return len(value)
         try:
             return len(json.dumps(value, default=str).encode('utf-8'))
         except:
             return 0
 
-    def get(self, key: str) -> Optional[T]:
+    def get(self, key: CacheKey) -> Optional[T]:
         """
         Obtém valor do cache.
 
@@ -116,7 +141,7 @@ class LRUCache(Generic[T]):
 
     def set(
         self,
-        key: str,
+        key: CacheKey,
         value: T,
         ttl: Optional[int] = None,
     ) -> None:
@@ -170,7 +195,7 @@ class LRUCache(Generic[T]):
         self._stats.size -= 1
         self._stats.memory_bytes -= old_entry.size_bytes
 
-    def delete(self, key: str) -> bool:
+    def delete(self, key: CacheKey) -> bool:
         """
         Remove entrada do cache.
 
@@ -198,7 +223,7 @@ class LRUCache(Generic[T]):
 
     def get_or_set(
         self,
-        key: str,
+        key: CacheKey,
         factory: Callable[[], T],
         ttl: Optional[int] = None,
     ) -> T:
@@ -255,22 +280,32 @@ class LRUCache(Generic[T]):
             return len(expired_keys)
 
 
+# Embedding em lista de floats ou já serializado (float32 bytes para sqlite-vec)
+Embedding = Union[list[float], bytes]
+
+
 class EmbeddingCache:
-    """Cache especializado para embeddings."""
+    """
+    Cache especializado para embeddings.
+
+    A chave usa o texto normalizado (minúsculas, espaços colapsados): os
+    modelos BGE-en são uncased, então variações de caixa/espaço geram o
+    mesmo embedding e compartilham a entrada.
+    """
 
     def __init__(self, max_size: int = 10000, ttl: int = 3600):
-        self._cache = LRUCache[list[float]](max_size=max_size, default_ttl=ttl)
+        self._cache = LRUCache[Embedding](max_size=max_size, default_ttl=ttl)
 
-    def _make_key(self, text: str) -> str:
-        """Cria chave de cache para texto."""
-        return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+    def _make_key(self, text: str) -> CacheKey:
+        """Cria chave de cache para texto normalizado."""
+        return hash_key(" ".join(text.lower().split()))
 
-    def get(self, text: str) -> Optional[list[float]]:
+    def get(self, text: str) -> Optional[Embedding]:
         """Obtém embedding do cache."""
         key = self._make_key(text)
         return self._cache.get(key)
 
-    def set(self, text: str, embedding: list[float]) -> None:
+    def set(self, text: str, embedding: Embedding) -> None:
         """Armazena embedding no cache."""
         key = self._make_key(text)
         self._cache.set(key, embedding)
@@ -278,8 +313,8 @@ class EmbeddingCache:
     def get_or_compute(
         self,
         text: str,
-        compute_fn: Callable[[str], list[float]],
-    ) -> list[float]:
+        compute_fn: Callable[[str], Embedding],
+    ) -> Embedding:
         """Obtém do cache ou computa embedding."""
         key = self._make_key(text)
         return self._cache.get_or_set(key, lambda: compute_fn(text))
@@ -295,12 +330,12 @@ class ResponseCache:
     def __init__(self, max_size: int = 1000, ttl: int = 300):  # 5 min default
         self._cache = LRUCache[dict](max_size=max_size, default_ttl=ttl)
 
-    def _make_key(self, query: str, top_k: int, **kwargs) -> str:
+    def _make_key(self, query: str, top_k: int, **kwargs) -> CacheKey:
         """Cria chave de cache para query incluindo parametros extras."""
         # Incluir parametros extras na chave (ex: use_reranking)
         extra = ":".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
         content = f"{query}:{top_k}:{extra}" if extra else f"{query}:{top_k}"
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+        return hash_key(content)
 
     def get(self, query: str, top_k: int = 5, **kwargs) -> Optional[dict]:
         """Obtém resposta do cache."""
@@ -317,9 +352,150 @@ class ResponseCache:
         return self._cache.stats
 
 
+class SemanticCache:
+    """
+    Cache semântico de resultados de busca.
+
+    Reaproveita o resultado de uma query anterior cujo embedding tenha
+    similaridade cosseno >= threshold ("listar componentes" ~ "quais
+    componentes existem"). Cada combinação de parâmetros (top_k,
+    use_adaptive, ...) tem seu buffer circular de embeddings normalizados;
+    o lookup é um único produto matriz-vetor (M @ q). Resultados que dependem
+    do texto exato da query (re-ranking) não devem entrar aqui.
+    """
+
+    def __init__(self, max_size: int = 512, threshold: float = 0.92, ttl: int = 300):
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl = ttl
+        # params -> (matriz de embeddings, timestamps, resultados, próxima posição)
+        self._buffers: dict[str, list] = {}
+        self._lock = threading.RLock()
+        self._stats = CacheStats(max_size=max_size)
+
+    @staticmethod
+    def _params_key(**kwargs) -> str:
+        return ":".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
+
+    @staticmethod
+    def _normalize(embedding: Embedding):
+        """Converte embedding (bytes float32 ou lista) em vetor unitário."""
+        if isinstance(embedding, (bytes, bytearray)):
+            vec = np.frombuffer(embedding, dtype=np.float32)
+        else:
+            vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def get(self, embedding: Embedding, **kwargs) -> Optional[Any]:
+        """Retorna resultado de query semanticamente equivalente, se houver."""
+        if np is None:
+            return None
+
+        query = self._normalize(embedding)
+        with self._lock:
+            buffer = self._buffers.get(self._params_key(**kwargs))
+            if buffer is None:
+                self._stats.misses += 1
+                return None
+
+            matrix, timestamps, results, _ = buffer
+            sims = matrix @ query
+            sims[timestamps < time.monotonic() - self.ttl] = -1.0  # Expirados/vazios
+            best = int(np.argmax(sims))
+
+            if sims[best] < self.threshold:
+                self._stats.misses += 1
+                return None
+
+            self._stats.hits += 1
+            return results[best]
+
+    def set(self, embedding: Embedding, results: Any, **kwargs) -> None:
+        """Armazena resultado associado ao embedding da query."""
+        if np is None:
+            return
+
+        query = self._normalize(embedding)
+        with self._lock:
+            key = self._params_key(**kwargs)
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = [
+                    np.zeros((self.max_size, query.shape[0]), dtype=np.float32),
+                    np.full(self.max_size, -np.inf),
+                    [None] * self.max_size,
+                    0,
+                ]
+                self._buffers[key] = buffer
+
+            matrix, timestamps, stored, position = buffer
+            if stored[position] is None:
+                self._stats.size += 1
+            else:
+                self._stats.evictions += 1
+            matrix[position] = query
+            timestamps[position] = time.monotonic()
+            stored[position] = results
+            buffer[3] = (position + 1) % self.max_size
+
+    def clear(self) -> None:
+        """Limpa todo o cache."""
+        with self._lock:
+            self._buffers.clear()
+            self._stats.size = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """Retorna estatísticas do cache."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                size=self._stats.size,
+                max_size=self._stats.max_size,
+                memory_bytes=sum(b[0].nbytes for b in self._buffers.values()),
+            )
+
+
+class DocumentCache:
+    """
+    Cache de leituras de documentos (get_document, list_sources).
+
+    Cada entrada guarda a versão dos dados em que foi lida: se a ingestão
+    incrementou a versão desde então, a entrada é tratada como miss. O TTL
+    cobre escritores que não incrementam a versão.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: int = 60):
+        self._cache = LRUCache[tuple](max_size=max_size, default_ttl=ttl)
+
+    def get(self, key: str, version: int) -> Optional[Any]:
+        """Obtém valor lido na versão informada."""
+        entry = self._cache.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def set(self, key: str, version: int, value: Any) -> None:
+        """Armazena valor lido na versão informada."""
+        self._cache.set(key, (version, value))
+
+    def clear(self) -> None:
+        """Limpa todo o cache."""
+        self._cache.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+
 # Instâncias globais
 _embedding_cache: Optional[EmbeddingCache] = None
 _response_cache: Optional[ResponseCache] = None
+_semantic_cache: Optional[SemanticCache] = None
+_document_cache: Optional[DocumentCache] = None
 
 
 def get_embedding_cache() -> EmbeddingCache:
@@ -338,6 +514,22 @@ def get_response_cache() -> ResponseCache:
     return _response_cache
 
 
+def get_semantic_cache() -> SemanticCache:
+    """Retorna cache semântico global."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache()
+    return _semantic_cache
+
+
+def get_document_cache() -> DocumentCache:
+    """Retorna cache global de documentos."""
+    global _document_cache
+    if _document_cache is None:
+        _document_cache = DocumentCache()
+    return _document_cache
+
+
 if __name__ == "__main__":
     print("=== Teste de Cache LRU ===\n")
 
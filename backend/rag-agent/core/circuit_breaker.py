@@ -161,12 +161,19 @@ class CircuitBreaker:
             self._stats.total_calls += 1
             self._stats.rejected_calls += 1
 
-    def call(self, func: Callable[[], T], fallback: Optional[Callable[[], T]] = None) -> T:
+    def call(
+        self,
+        func: Callable[..., T],
+        *args,
+        fallback: Optional[Callable[[], T]] = None,
+        **kwargs,
+    ) -> T:
         """
         Executa função com proteção do circuit breaker.
 
         Args:
             func: Função a executar
+            *args, **kwargs: Argumentos repassados a func (dispensa closures)
             fallback: Função de fallback se circuit aberto
 
         Returns:
@@ -200,7 +207,7 @@ class CircuitBreaker:
                     )
 
         try:
-            result = func()
+            result = func(*args, **kwargs)
             self._record_success()
             return result
         except Exception as e:
@@ -236,10 +243,7 @@ def circuit_breaker(
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs):
-            return cb.call(
-                lambda: func(*args, **kwargs),
-                fallback=fallback
-            )
+            return cb.call(func, *args, fallback=fallback, **kwargs)
 
         wrapper.circuit_breaker = cb
         return wrapper
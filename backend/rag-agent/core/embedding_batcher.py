@@ -0,0 +1,102 @@
+# =============================================================================
+# EMBEDDING BATCHER - Micro-batching de Embeddings
+# =============================================================================
+# Agrupa queries concorrentes em uma única chamada ao modelo: um forward ONNX
+# sobre o lote em vez de um forward por query
+# =============================================================================
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batcher de embeddings com worker em thread dedicada.
+
+    Pedidos que chegam enquanto um lote está aberto (até `max_batch` itens ou
+    `max_wait_ms` desde o primeiro) são embedados juntos. Atende tanto código
+    assíncrono (`embed`) quanto síncrono (`embed_sync`): o modelo roda fora
+    do event loop em ambos os casos.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[list[str]], list[Any]],
+        max_batch: int = 16,
+        max_wait_ms: float = 5.0,
+    ):
+        """
+        Args:
+            embed_fn: Função que recebe lista de textos e retorna um vetor por texto
+            max_batch: Tamanho máximo do lote
+            max_wait_ms: Espera máxima para completar o lote
+        """
+        self._embed_fn = embed_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._pending: list[tuple[str, Future]] = []
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._worker: Optional[threading.Thread] = None
+
+    def _ensure_worker(self) -> None:
+        """Inicia a thread worker (lazy). Chamar com o lock adquirido."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+            self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        """Enfileira texto; o Future recebe o vetor quando o lote rodar."""
+        future: Future = Future()
+        with self._ready:
+            self._ensure_worker()
+            self._pending.append((text, future))
+            self._ready.notify()
+        return future
+
+    async def embed(self, text: str) -> Any:
+        """Enfileira texto e aguarda o embedding do lote (sem bloquear o loop)."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def embed_sync(self, text: str) -> Any:
+        """Versão bloqueante de `embed` para código síncrono."""
+        return self.submit(text).result()
+
+    def _next_batch(self) -> list[tuple[str, Future]]:
+        """Aguarda o primeiro pedido e completa o lote até o prazo."""
+        with self._ready:
+            while not self._pending:
+                self._ready.wait()
+
+            deadline = time.monotonic() + self.max_wait
+            while len(self._pending) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                self._ready.wait(timeout)
+
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            return batch
+
+    def _run(self) -> None:
+        """Worker: coleta um lote e executa o modelo uma vez para todos."""
+        while True:
+            batch = self._next_batch()
+            # Pedidos cancelados (ex.: task assíncrona cancelada) saem do lote
+            batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                vectors = self._embed_fn([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
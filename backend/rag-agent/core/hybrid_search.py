@@ -7,20 +7,44 @@
 import math
 import re
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional
-import apsw
-import sqlite_vec
-from fastembed import TextEmbedding
 from pathlib import Path
 import sys
 
 # Adicionar parent ao path para importar config
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from core.config import get_config
-
-
-@dataclass
+from core.config import get_config, vector_param, distance_scale
+from core.connection_pool import get_connection_pool
+from core.embedding_model import get_embedding_model
+from core.cache import get_embedding_cache
+
+# SQL fixo (mesmo texto a cada chamada: reaproveitado pelo cache de statements do apsw)
+BM25_INDEX_SQL = "SELECT id, conteudo FROM documentos WHERE conteudo IS NOT NULL"
+
+# Conteúdo truncado (e NULL -> "") no SQLite: só os primeiros 1000 caracteres
+# chegam ao Python
+DOCUMENT_SQL = "SELECT nome, SUBSTR(COALESCE(conteudo, ''), 1, 1000), tipo FROM documentos WHERE id = ?"
+
+# KNN isolado em CTE: o join com documentos só toca as k linhas vencedoras
+VECTOR_SEARCH_SQL = """
+    WITH hits AS (
+        SELECT doc_id, distance
+        FROM vec_documentos
+        WHERE embedding MATCH {vector_param} AND k = ?
+    )
+    SELECT h.doc_id, h.distance, d.nome, SUBSTR(COALESCE(d.conteudo, ''), 1, 1000), d.tipo
+    FROM hits h
+    JOIN documentos d ON d.id = h.doc_id
+    ORDER BY h.distance
+"""
+
+# Executor compartilhado: busca vetorial em paralelo com o BM25
+_search_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hybrid-search")
+
+
+@dataclass(slots=True)
 class SearchResult:
     """Resultado de busca híbrida."""
     doc_id: int
@@ -143,42 +167,73 @@ class HybridSearch:
         bm25_weight: float = 0.3,       # Peso do BM25
     ):
         self.db_path = db_path
+        self._pool = get_connection_pool(db_path)
         self.vector_weight = vector_weight
         self.bm25_weight = bm25_weight
 
         # Carregar configuração e modelo de embeddings
         config = get_config()
-        self.model = TextEmbedding(config.embedding_model.value)
+        self.model = get_embedding_model()  # sessão ONNX compartilhada
+        self._vector_sql = VECTOR_SEARCH_SQL.format(vector_param=vector_param(config.embedding_quantization))
+        self._distance_scale = distance_scale(config.embedding_quantization)
+        self._query_vec_cache = get_embedding_cache()
 
         # Inicializar BM25
         self.bm25 = BM25()
         self._index_bm25()
 
-    def _get_connection(self):
-        """Cria conexão com sqlite-vec."""
-        conn = apsw.Connection(self.db_path)
-        conn.enableloadextension(True)
-        conn.loadextension(sqlite_vec.loadable_path())
-        conn.enableloadextension(False)
-        return conn
-
     def _index_bm25(self) -> None:
         """Indexa documentos para BM25."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._pool.acquire() as conn:
+            cursor = conn.cursor()
+            documents = []
+            for row in cursor.execute(BM25_INDEX_SQL):
+                documents.append((row[0], row[1]))
 
-        documents = []
-        for row in cursor.execute("SELECT id, conteudo FROM documentos WHERE conteudo IS NOT NULL"):
-            documents.append((row[0], row[1]))
-
-        conn.close()
         self.bm25.index(documents)
 
+    def embed_query(self, query: str) -> bytes:
+        """Embedding da query já serializado (float32), com cache."""
+        # Vetor serializado em cache: hit vai direto ao bind
+        query_vec = self._query_vec_cache.get(query)
+        if query_vec is None:
+            embeddings = list(self.model.embed([query]))
+            query_vec = embeddings[0].astype("float32", copy=False).tobytes()
+            self._query_vec_cache.set(query, query_vec)
+        return query_vec
+
+    def _vector_search(
+        self,
+        query: str,
+        vector_top_k: int,
+        query_vec: Optional[bytes] = None,
+    ) -> dict[int, dict]:
+        """KNN (com embedding da query, se não informado); retorna {doc_id: dados e vector_score}."""
+        if query_vec is None:
+            query_vec = self.embed_query(query)
+
+        vector_results = {}
+        with self._pool.acquire() as conn:
+            cursor = conn.cursor()
+            for row in cursor.execute(self._vector_sql, (query_vec, vector_top_k)):
+                doc_id, distance, nome, conteudo, tipo = row
+                similarity = max(0, 1 - distance / self._distance_scale)
+                vector_results[doc_id] = {
+                    "vector_score": similarity,
+                    "nome": nome,
+                    "conteudo": conteudo,
+                    "tipo": tipo,
+                }
+
+        return vector_results
+
     def search(
         self,
         query: str,
         top_k: int = 10,
         vector_top_k: int = 20,         # Buscar mais no vetorial para combinar
+        vector_weight: Optional[float] = None,
+        query_vec: Optional[bytes] = None,
     ) -> list[SearchResult]:
         """
         Busca híbrida.
@@ -187,37 +242,24 @@ class HybridSearch:
             query: Query de busca
             top_k: Número de resultados finais
             vector_top_k: Número de candidatos da busca vetorial
+            vector_weight: Peso vetorial desta busca (None = peso da instância;
+                BM25 recebe 1 - vector_weight)
+            query_vec: Embedding já calculado (ver embed_query); None = calcular aqui
 
         Returns:
             Lista de SearchResult ordenada por score híbrido
         """
-        # 1. Busca vetorial
-        embeddings = list(self.model.embed([query]))
-        query_vec = sqlite_vec.serialize_float32(embeddings[0].tolist())
+        if vector_weight is None:
+            vector_weight, bm25_weight = self.vector_weight, self.bm25_weight
+        else:
+            bm25_weight = 1 - vector_weight
 
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        # 1. Busca vetorial em thread do pool (ONNX e SQLite liberam o GIL)...
+        vector_future = _search_executor.submit(self._vector_search, query, vector_top_k, query_vec)
 
-        vector_results = {}
-        for row in cursor.execute("""
-            SELECT v.doc_id, v.distance, d.nome, d.conteudo, d.tipo
-            FROM vec_documentos v
-            JOIN documentos d ON d.id = v.doc_id
-            WHERE v.embedding MATCH ? AND k = ?
-        """, (query_vec, vector_top_k)):
-            doc_id, distance, nome, conteudo, tipo = row
-            similarity = max(0, 1 - distance)
-            vector_results[doc_id] = {
-                "vector_score": similarity,
-                "nome": nome,
-                "conteudo": conteudo,
-                "tipo": tipo,
-            }
-
-        conn.close()
-
-        # 2. Busca BM25 nos mesmos documentos + extras
+        # 2. ...enquanto o BM25 roda nesta thread: latência = max, não soma
         bm25_scores = self.bm25.search(query)
+        vector_results = vector_future.result()
 
         # 3. Combinar resultados
         all_doc_ids = set(vector_results.keys()) | set(bm25_scores.keys())
@@ -233,24 +275,16 @@ class HybridSearch:
 
             # Score híbrido ponderado
             hybrid_score = (
-                self.vector_weight * vector_score +
-                self.bm25_weight * bm25_score
+                vector_weight * vector_score +
+                bm25_weight * bm25_score
             )
 
             # Buscar dados do documento se não tiver
             if doc_id in vector_results:
                 doc_data = vector_results[doc_id]
             else:
-                conn = self._get_connection()
-                cursor = conn.cursor()
-                row = None
-                for r in cursor.execute(
-                    "SELECT nome, conteudo, tipo FROM documentos WHERE id = ?",
-                    (doc_id,)
-                ):
-                    row = r
-                    break
-                conn.close()
+                with self._pool.acquire() as conn:
+                    row = conn.cursor().execute(DOCUMENT_SQL, (doc_id,)).fetchone()
                 if row:
                     doc_data = {"nome": row[0], "conteudo": row[1], "tipo": row[2]}
                 else:
@@ -260,7 +294,7 @@ class HybridSearch:
                 doc_id=doc_id,
                 nome=doc_data["nome"],
                 tipo=doc_data["tipo"],
-                content=doc_data["conteudo"][:1000] if doc_data["conteudo"] else "",
+                content=doc_data["conteudo"],
                 vector_score=round(vector_score, 3),
                 bm25_score=round(bm25_score, 3),
                 hybrid_score=round(hybrid_score, 3),
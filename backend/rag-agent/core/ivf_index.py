@@ -0,0 +1,189 @@
+# =============================================================================
+# IVF INDEX - Busca Aproximada por Clusters sobre sqlite-vec
+# =============================================================================
+# O MATCH do vec0 é um scan linear. Com IVF os vetores são agrupados em
+# ~sqrt(N) clusters (k-means esférico); a busca compara a query com os
+# centróides e varre só os `probes` clusters mais próximos (partition key).
+# A ingestão insere novos vetores no cluster mais próximo; a versão dos dados
+# coberta pelo índice fica em rag_meta para a busca detectar índice defasado.
+# =============================================================================
+
+import heapq
+import math
+from operator import itemgetter
+from typing import Optional
+
+import apsw
+import numpy as np
+
+from core.config import META_TABLE, META_TABLE_DDL, DATA_VERSION_SQL
+
+
+IVF_TABLE = "vec_documentos_ivf"
+CENTROIDS_TABLE = "vec_centroides"
+
+CENTROIDS_SQL = f"""
+    SELECT cluster_id
+    FROM {CENTROIDS_TABLE}
+    WHERE embedding MATCH ? AND k = ?
+"""
+
+IVF_KNN_SQL = f"""
+    SELECT doc_id, distance
+    FROM {IVF_TABLE}
+    WHERE embedding MATCH ? AND k = ? AND cluster_id = ?
+"""
+
+IVF_DELETE_SQL = f"DELETE FROM {IVF_TABLE} WHERE doc_id = ?"
+IVF_INSERT_SQL = f"INSERT INTO {IVF_TABLE} (doc_id, cluster_id, embedding) VALUES (?, ?, ?)"
+
+# Versão dos dados refletida no índice (igual a data_version = índice em dia)
+IVF_VERSION_SQL = f"SELECT value FROM {META_TABLE} WHERE key = 'ivf_data_version'"
+MARK_IVF_CURRENT_SQL = f"""
+    INSERT INTO {META_TABLE} (key, value)
+    SELECT 'ivf_data_version', COALESCE(({DATA_VERSION_SQL}), 0) WHERE 1
+    ON CONFLICT(key) DO UPDATE SET value = excluded.value
+"""
+
+
+def kmeans(
+    vectors: np.ndarray,
+    n_clusters: int,
+    iterations: int = 20,
+    seed: int = 42,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    K-means esférico (similaridade de cosseno; vetores normalizados).
+
+    Returns:
+        (centróides normalizados, cluster de cada vetor)
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = np.argmax(vectors @ centroids.T, axis=1)
+        for c in range(n_clusters):
+            members = vectors[labels == c]
+            if len(members):
+                centroid = members.mean(axis=0)
+            else:
+                # Cluster vazio: re-semear com um vetor aleatório
+                centroid = vectors[rng.integers(len(vectors))]
+            centroids[c] = centroid / max(np.linalg.norm(centroid), 1e-12)
+
+    labels = np.argmax(vectors @ centroids.T, axis=1)
+    return centroids, labels
+
+
+def build_ivf_index(cursor, source_sql: str, n_clusters: Optional[int] = None) -> int:
+    """
+    (Re)cria as tabelas IVF a partir dos vetores float32 existentes.
+
+    Args:
+        cursor: Cursor apsw com sqlite-vec carregado
+        source_sql: SELECT que retorna (doc_id, embedding float32)
+        n_clusters: Número de clusters (None = sqrt(N))
+
+    Returns:
+        Número de clusters criados (0 se não houver vetores)
+    """
+    rows = list(cursor.execute(source_sql))
+    if not rows:
+        return 0
+
+    doc_ids = [doc_id for doc_id, _ in rows]
+    vectors = np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob in rows])
+    dimensions = vectors.shape[1]
+
+    n_clusters = min(n_clusters or max(1, round(math.sqrt(len(rows)))), len(rows))
+    centroids, labels = kmeans(vectors, n_clusters)
+
+    cursor.execute(f"DROP TABLE IF EXISTS {CENTROIDS_TABLE}")
+    cursor.execute(f"DROP TABLE IF EXISTS {IVF_TABLE}")
+    cursor.execute(f"""
+        CREATE VIRTUAL TABLE {CENTROIDS_TABLE} USING vec0(
+            cluster_id INTEGER PRIMARY KEY,
+            embedding float[{dimensions}]
+        )
+    """)
+    cursor.execute(f"""
+        CREATE VIRTUAL TABLE {IVF_TABLE} USING vec0(
+            doc_id INTEGER PRIMARY KEY,
+            cluster_id INTEGER PARTITION KEY,
+            embedding float[{dimensions}]
+        )
+    """)
+
+    cursor.executemany(
+        f"INSERT INTO {CENTROIDS_TABLE} (cluster_id, embedding) VALUES (?, ?)",
+        [(c, centroids[c].astype(np.float32).tobytes()) for c in range(n_clusters)],
+    )
+    cursor.executemany(
+        IVF_INSERT_SQL,
+        [(doc_id, int(label), blob) for doc_id, label, (_, blob) in zip(doc_ids, labels, rows)],
+    )
+
+    mark_ivf_current(cursor)
+    return n_clusters
+
+
+def drop_ivf_index(cursor) -> None:
+    """Remove tabelas e versão do índice IVF (ex.: vetores trocados por outro modelo)."""
+    cursor.execute(f"DROP TABLE IF EXISTS {CENTROIDS_TABLE}")
+    cursor.execute(f"DROP TABLE IF EXISTS {IVF_TABLE}")
+    cursor.execute(META_TABLE_DDL)
+    cursor.execute(f"DELETE FROM {META_TABLE} WHERE key = 'ivf_data_version'")
+
+
+def mark_ivf_current(cursor) -> None:
+    """Registra que o índice IVF cobre a versão atual dos dados."""
+    cursor.execute(META_TABLE_DDL)
+    cursor.execute(MARK_IVF_CURRENT_SQL)
+
+
+def ivf_is_current(cursor) -> bool:
+    """Índice IVF construído e em dia com a versão dos dados?"""
+    try:
+        ivf_row = cursor.execute(IVF_VERSION_SQL).fetchone()
+        data_row = cursor.execute(DATA_VERSION_SQL).fetchone()
+    except apsw.SQLError:
+        return False  # Tabela rag_meta ainda não existe
+    if ivf_row is None:
+        return False  # Índice nunca construído (ou anterior ao controle de versão)
+    return ivf_row[0] == (data_row[0] if data_row else 0)
+
+
+def add_to_ivf_index(cursor, doc_id: int, embedding: bytes) -> bool:
+    """
+    Insere (ou move) um vetor float32 no cluster de centróide mais próximo.
+
+    Returns:
+        False se o índice IVF não existe (nada a atualizar)
+    """
+    try:
+        row = cursor.execute(CENTROIDS_SQL, (embedding, 1)).fetchone()
+    except apsw.SQLError:
+        return False  # Tabelas IVF nunca criadas
+    if row is None:
+        return False
+
+    cursor.execute(IVF_DELETE_SQL, (doc_id,))
+    cursor.execute(IVF_INSERT_SQL, (doc_id, row[0], embedding))
+    return True
+
+
+def ivf_search(cursor, query_vec: bytes, k: int, probes: int) -> list[tuple[int, float]]:
+    """
+    KNN aproximado: varre apenas os `probes` clusters mais próximos.
+
+    Returns:
+        Lista de (doc_id, distance) ordenada por distância (até k itens)
+    """
+    clusters = [row[0] for row in cursor.execute(CENTROIDS_SQL, (query_vec, probes))]
+
+    hits = []
+    for cluster_id in clusters:
+        hits.extend(cursor.execute(IVF_KNN_SQL, (query_vec, k, cluster_id)))
+
+    return heapq.nsmallest(k, hits, key=itemgetter(1))
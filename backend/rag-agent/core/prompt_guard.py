@@ -5,10 +5,53 @@
 # =============================================================================
 
 import re
+import threading
+from functools import lru_cache
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+# RE2 (google-re2) garante matching em tempo linear, sem backtracking
+# catastrófico. Padrões incompatíveis (ex: lookahead) continuam no `re`.
+RE2_AVAILABLE = False
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    re2 = None
+
+
+def _compile(pattern: str):
+    """Compila padrão case-insensitive com RE2 quando possível, senão com `re`."""
+    if RE2_AVAILABLE:
+        try:
+            options = re2.Options()
+            options.case_sensitive = False
+            return re2.compile(pattern, options)
+        except Exception:
+            pass
+    return re.compile(pattern, re.IGNORECASE)
+
+
+# Hyperscan (opcional): um único DFA multi-padrão (SIMD) para todos os padrões
+# compatíveis. Padrões com lookaround não compilam nele e seguem via regex.
+HYPERSCAN_AVAILABLE = False
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    hyperscan = None
+
+
+# Regexes auxiliares compiladas uma única vez (evita lookup no cache do re)
+_BASE64_RE = re.compile(r"[A-Za-z0-9+/]{50,}={0,2}")
+_ZERO_WIDTH_RE = re.compile(r"[\u200b\u200c\u200d\ufeff]")
+# Homoglifos cirílicos de a, e, o, p, c, x
+_HOMOGLYPH_RE = re.compile("[аеорсх]")
+_XML_TAG_RE = re.compile(r"<\|[^>]+\|>")
+_CODE_BLOCK_RE = re.compile(r"```(system|admin|root)", re.IGNORECASE)
+_TRIPLE_QUOTE_RE = re.compile(r'"""[\s\S]*?(system|instruction|prompt)', re.IGNORECASE)
+
 
 class ThreatLevel(str, Enum):
     """Nível de ameaça detectada."""
@@ -19,14 +62,15 @@ class ThreatLevel(str, Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScanResult:
-    """Resultado da análise de prompt."""
+    """Resultado da análise de prompt (imutável: pode vir do cache de scan)."""
     is_safe: bool
     threat_level: ThreatLevel
-    threats_detected: list[str]
+    threats_detected: tuple[str, ...]  # Tupla: frozen não protege o conteúdo de uma lista
     sanitized_input: Optional[str] = None
     blocked_reason: Optional[str] = None
+    message: str = "OK"
 
 
 class PromptGuard:
@@ -60,13 +104,16 @@ class PromptGuard:
         r"\bdan\b.*\bmode\b",
         r"do\s+anything\s+now",
         r"jailbreak(ed)?",
+    ]
 
+    # Literais de alta severidade (checados com `in`, sem motor de regex)
+    HIGH_SEVERITY_LITERALS = [
         # Instruções de sistema falsas
-        r"\[system\]",
-        r"\[admin\]",
-        r"\[developer\]",
-        r"<\|system\|>",
-        r"<\|assistant\|>",
+        "[system]",
+        "[admin]",
+        "[developer]",
+        "<|system|>",
+        "<|assistant|>",
     ]
 
     # Padrões de média severidade (análise adicional)
@@ -90,12 +137,23 @@ class PromptGuard:
 
     # Padrões de baixa severidade (logging apenas)
     LOW_SEVERITY_PATTERNS = [
-        r"hypothetically",
         r"in\s+theory",
         r"for\s+educational\s+purposes",
         r"just\s+curious",
     ]
 
+    LOW_SEVERITY_LITERALS = [
+        "hypothetically",
+    ]
+
+    # Cache de resultados (prompts repetidos: retries, reenvios do cliente)
+    SCAN_CACHE_SIZE = 4096
+    SCAN_CACHE_MAX_LEN = 10_000  # Textos maiores não são cacheados
+
+    # Limites de tamanho da varredura
+    MIN_PATTERN_CHARS = 5  # Nenhum padrão/delimitador casa com menos que isso
+    MAX_SCAN_CHARS = 65_536  # Acima disso o prompt é bloqueado sem varredura
+
     def __init__(self, strict_mode: bool = False):
         """
         Inicializa o guard.
@@ -103,10 +161,28 @@ class PromptGuard:
         Args:
             strict_mode: Se True, bloqueia também padrões de média severidade
         """
+        # Padrões compilados no carregamento da classe, compartilhados entre instâncias
+        self._high_patterns = _HIGH_COMPILED
+        self._medium_patterns = _MEDIUM_COMPILED
+        self._low_patterns = _LOW_COMPILED
+        self._high_fused = _HIGH_FUSED
+        self._medium_fused = _MEDIUM_FUSED
+        self._low_fused = _LOW_FUSED
+        # Resultados cacheados são compartilhados entre chamadas: ScanResult é
+        # imutável (threats_detected em tupla)
+        self._scan_cached = lru_cache(maxsize=self.SCAN_CACHE_SIZE)(self._scan_uncached)
         self.strict_mode = strict_mode
-        self._high_patterns = [re.compile(p, re.IGNORECASE) for p in self.HIGH_SEVERITY_PATTERNS]
-        self._medium_patterns = [re.compile(p, re.IGNORECASE) for p in self.MEDIUM_SEVERITY_PATTERNS]
-        self._low_patterns = [re.compile(p, re.IGNORECASE) for p in self.LOW_SEVERITY_PATTERNS]
+
+    @property
+    def strict_mode(self) -> bool:
+        """Bloqueia também padrões de média severidade."""
+        return self._strict_mode
+
+    @strict_mode.setter
+    def strict_mode(self, value: bool) -> None:
+        # O veredito cacheado depende do modo: trocar o modo invalida o cache
+        self._strict_mode = value
+        self._scan_cached.cache_clear()
 
     def scan(self, text: str) -> ScanResult:
         """
@@ -118,41 +194,73 @@ class PromptGuard:
         Returns:
             ScanResult com detalhes da análise
         """
+        if text and len(text) <= self.SCAN_CACHE_MAX_LEN:
+            return self._scan_cached(text)
+        return self._scan_uncached(text)
+
+    def _scan_uncached(self, text: str) -> ScanResult:
+        """Executa a análise completa (sem cache)."""
         if not text:
             return ScanResult(
                 is_safe=True,
                 threat_level=ThreatLevel.NONE,
-                threats_detected=[],
+                threats_detected=(),
+            )
+
+        # Truncar abriria brecha (injeção após o limite), então bloqueia
+        if len(text) > self.MAX_SCAN_CHARS:
+            return self._build_result(
+                [f"INPUT: Prompt exceeds {self.MAX_SCAN_CHARS} characters"],
+                ThreatLevel.HIGH,
+            )
+
+        # Textos curtos: só os checks de encoding (ex: zero-width) se aplicam
+        if len(text) < self.MIN_PATTERN_CHARS:
+            encoding_threats = self._check_encoding_tricks(text)
+            return self._build_result(
+                encoding_threats,
+                ThreatLevel.MEDIUM if encoding_threats else ThreatLevel.NONE,
             )
 
         threats = []
         threat_level = ThreatLevel.NONE
+        text_lower = text.lower()
+        hs_hits = _hyperscan_hits(text) if _HS_DB is not None else None
 
-        # Verificar padrões de alta severidade
-        for pattern in self._high_patterns:
-            if pattern.search(text):
-                threats.append(f"HIGH: {pattern.pattern[:50]}...")
+        # Verificar padrões de alta severidade (literais antes das regexes)
+        for literal in self.HIGH_SEVERITY_LITERALS:
+            if literal in text_lower:
+                threats.append(_THREAT_LABELS[literal])
                 threat_level = ThreatLevel.HIGH
 
-        # Verificar padrões de média severidade
-        for pattern in self._medium_patterns:
-            if pattern.search(text):
-                threats.append(f"MEDIUM: {pattern.pattern[:50]}...")
-                if threat_level not in [ThreatLevel.HIGH, ThreatLevel.CRITICAL]:
-                    threat_level = ThreatLevel.MEDIUM
-
-        # Verificar padrões de baixa severidade
-        for pattern in self._low_patterns:
-            if pattern.search(text):
-                threats.append(f"LOW: {pattern.pattern[:50]}...")
+        for pattern in self._tier_matches(self._high_patterns, self._high_fused, text, hs_hits):
+            threats.append(_THREAT_LABELS[pattern.pattern])
+            threat_level = ThreatLevel.HIGH
+
+        # Match de alta severidade já garante bloqueio: os níveis inferiores
+        # não alteram o resultado, então só são avaliados se nada foi achado.
+        if threat_level == ThreatLevel.NONE:
+            # Verificar padrões de média severidade
+            for pattern in self._tier_matches(self._medium_patterns, self._medium_fused, text, hs_hits):
+                threats.append(_THREAT_LABELS[pattern.pattern])
+                threat_level = ThreatLevel.MEDIUM
+
+            # Verificar padrões de baixa severidade
+            for literal in self.LOW_SEVERITY_LITERALS:
+                if literal in text_lower:
+                    threats.append(_THREAT_LABELS[literal])
+                    if threat_level == ThreatLevel.NONE:
+                        threat_level = ThreatLevel.LOW
+
+            for pattern in self._tier_matches(self._low_patterns, self._low_fused, text, hs_hits):
+                threats.append(_THREAT_LABELS[pattern.pattern])
                 if threat_level == ThreatLevel.NONE:
                     threat_level = ThreatLevel.LOW
 
-        # Verificar encoding tricks
-        encoding_threats = self._check_encoding_tricks(text)
-        if encoding_threats:
-            threats.extend(encoding_threats)
-            if threat_level not in [ThreatLevel.HIGH, ThreatLevel.CRITICAL]:
+            # Verificar encoding tricks
+            encoding_threats = self._check_encoding_tricks(text)
+            if encoding_threats:
+                threats.extend(encoding_threats)
                 threat_level = ThreatLevel.MEDIUM
 
         # Verificar delimitadores suspeitos
@@ -161,42 +269,57 @@ class PromptGuard:
             threats.extend(delimiter_threats)
             threat_level = ThreatLevel.CRITICAL
 
+        return self._build_result(threats, threat_level)
+
+    def _build_result(self, threats: list[str], threat_level: ThreatLevel) -> ScanResult:
+        """Monta o ScanResult a partir das ameaças e do nível final."""
         # Determinar se é seguro
         is_safe = threat_level in [ThreatLevel.NONE, ThreatLevel.LOW]
         if self.strict_mode and threat_level == ThreatLevel.MEDIUM:
             is_safe = False
 
+        blocked_reason = threats[0] if not is_safe else None
         return ScanResult(
             is_safe=is_safe,
             threat_level=threat_level,
-            threats_detected=threats,
-            blocked_reason=threats[0] if not is_safe else None,
+            threats_detected=tuple(threats),
+            blocked_reason=blocked_reason,
+            message="OK" if is_safe else (blocked_reason or "Prompt blocked by security filter"),
         )
 
+    @staticmethod
+    def _tier_matches(patterns: list, fused, text: str, hs_hits: Optional[set[str]]) -> list:
+        """
+        Retorna os padrões de um nível que casam com o texto.
+
+        Com Hyperscan, os padrões compatíveis já foram resolvidos em uma única
+        varredura (hs_hits). Sem ele, a alternação fundida do nível serve de
+        pré-filtro e só em caso de match os padrões individuais são testados.
+        """
+        if hs_hits is None:
+            if not fused.search(text):
+                return []
+            return [p for p in patterns if p.search(text)]
+        return [
+            p for p in patterns
+            if (p.pattern in hs_hits if p.pattern in _HS_PATTERN_SET else p.search(text))
+        ]
+
     def _check_encoding_tricks(self, text: str) -> list[str]:
         """Verifica tentativas de bypass via encoding."""
         threats = []
 
         # Base64 suspeito
-        if re.search(r"[A-Za-z0-9+/]{50,}={0,2}", text):
+        if _BASE64_RE.search(text):
             threats.append("ENCODING: Possible base64 encoded content")
 
-        # Unicode homoglyphs
-        homoglyphs = {
-            'а': 'a',  # Cyrillic
-            'е': 'e',
-            'о': 'o',
-            'р': 'p',
-            'с': 'c',
-            'х': 'x',
-        }
-        for char in homoglyphs:
-            if char in text:
-                threats.append(f"ENCODING: Unicode homoglyph detected ({char})")
-                break
+        # Unicode homoglyphs (uma varredura para todo o conjunto)
+        homoglyph = _HOMOGLYPH_RE.search(text)
+        if homoglyph:
+            threats.append(f"ENCODING: Unicode homoglyph detected ({homoglyph.group()})")
 
         # Zero-width characters
-        if re.search(r"[\u200b\u200c\u200d\ufeff]", text):
+        if _ZERO_WIDTH_RE.search(text):
             threats.append("ENCODING: Zero-width characters detected")
 
         return threats
@@ -206,15 +329,15 @@ class PromptGuard:
         threats = []
 
         # XML/HTML tags suspeitas
-        if re.search(r"<\|[^>]+\|>", text):
+        if _XML_TAG_RE.search(text):
             threats.append("DELIMITER: Suspicious XML-like tags")
 
         # Markdown code blocks tentando injetar
-        if re.search(r"```(system|admin|root)", text, re.IGNORECASE):
+        if _CODE_BLOCK_RE.search(text):
             threats.append("DELIMITER: Code block injection attempt")
 
         # Triple quotes com instruções
-        if re.search(r'"""[\s\S]*?(system|instruction|prompt)', text, re.IGNORECASE):
+        if _TRIPLE_QUOTE_RE.search(text):
             threats.append("DELIMITER: Triple quote injection")
 
         return threats
@@ -235,18 +358,113 @@ class PromptGuard:
         result = text
 
         # Remover zero-width characters
-        result = re.sub(r"[\u200b\u200c\u200d\ufeff]", "", result)
+        result = _ZERO_WIDTH_RE.sub("", result)
 
         # Escapar delimitadores
         result = result.replace("<|", "< |").replace("|>", "| >")
 
-        # Remover padrões de alta severidade
-        for pattern in self._high_patterns:
-            result = pattern.sub("[BLOCKED]", result)
+        # Remover padrões de alta severidade (regexes + literais) em uma passada
+        result = _HIGH_SANITIZE.sub("[BLOCKED]", result)
 
         return result
 
 
+# Compilação única dos padrões (import time)
+_HIGH_COMPILED = [_compile(p) for p in PromptGuard.HIGH_SEVERITY_PATTERNS]
+_MEDIUM_COMPILED = [_compile(p) for p in PromptGuard.MEDIUM_SEVERITY_PATTERNS]
+_LOW_COMPILED = [_compile(p) for p in PromptGuard.LOW_SEVERITY_PATTERNS]
+
+# Rótulos das ameaças montados uma vez (padrão/literal -> texto reportado)
+_THREAT_LABELS = {
+    p: f"{level}: {p[:50]}..."
+    for level, patterns in (
+        ("HIGH", PromptGuard.HIGH_SEVERITY_PATTERNS + PromptGuard.HIGH_SEVERITY_LITERALS),
+        ("MEDIUM", PromptGuard.MEDIUM_SEVERITY_PATTERNS),
+        ("LOW", PromptGuard.LOW_SEVERITY_PATTERNS + PromptGuard.LOW_SEVERITY_LITERALS),
+    )
+    for p in patterns
+}
+
+
+def _fuse(patterns: list[str]):
+    """Combina padrões em uma única alternação (uma varredura por nível)."""
+    return _compile("|".join(f"(?:{p})" for p in patterns))
+
+
+_HIGH_FUSED = _fuse(PromptGuard.HIGH_SEVERITY_PATTERNS)
+_MEDIUM_FUSED = _fuse(PromptGuard.MEDIUM_SEVERITY_PATTERNS)
+_LOW_FUSED = _fuse(PromptGuard.LOW_SEVERITY_PATTERNS)
+
+
+def _build_hyperscan_db(patterns: list[str]):
+    """
+    Compila os padrões compatíveis com Hyperscan em um único banco.
+
+    Returns:
+        (database, padrões compilados) ou (None, ()) se indisponível
+    """
+    if not HYPERSCAN_AVAILABLE:
+        return None, ()
+
+    flags = (
+        hyperscan.HS_FLAG_CASELESS
+        | hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+        | hyperscan.HS_FLAG_SINGLEMATCH
+    )
+    compatible = []
+    for pattern in patterns:
+        try:
+            probe = hyperscan.Database()
+            probe.compile(expressions=[pattern.encode()], flags=[flags])
+            compatible.append(pattern)
+        except Exception:
+            pass  # Ex: lookahead não suportado
+
+    if not compatible:
+        return None, ()
+
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[p.encode() for p in compatible],
+        ids=list(range(len(compatible))),
+        elements=len(compatible),
+        flags=[flags] * len(compatible),
+    )
+    return db, tuple(compatible)
+
+
+_HS_DB, _HS_PATTERNS = _build_hyperscan_db(
+    PromptGuard.HIGH_SEVERITY_PATTERNS
+    + PromptGuard.MEDIUM_SEVERITY_PATTERNS
+    + PromptGuard.LOW_SEVERITY_PATTERNS
+)
+_HS_PATTERN_SET = frozenset(_HS_PATTERNS)
+_hs_local = threading.local()  # Scratch do Hyperscan não é thread-safe
+
+
+def _hyperscan_hits(text: str) -> set[str]:
+    """Varre o texto uma vez e retorna os padrões Hyperscan que casaram."""
+    scratch = getattr(_hs_local, "scratch", None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_HS_DB)
+
+    hits: set[str] = set()
+
+    def on_match(pattern_id, start, end, flags, context):
+        hits.add(_HS_PATTERNS[pattern_id])
+
+    _HS_DB.scan(text.encode("utf-8", "replace"), match_event_handler=on_match, scratch=scratch)
+    return hits
+
+
+# sanitize(): uma única alternação com regexes + literais escapados (um só sub)
+_HIGH_SANITIZE = _fuse(
+    PromptGuard.HIGH_SEVERITY_PATTERNS
+    + [re.escape(lit) for lit in PromptGuard.HIGH_SEVERITY_LITERALS]
+)
+
+
 # Instância global
 _prompt_guard: Optional[PromptGuard] = None
 
@@ -6,7 +6,7 @@
 
 import time
 import threading
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from typing import Optional
 
@@ -43,17 +43,21 @@ class SlidingWindowRateLimiter:
     Rate limiter com janela deslizante.
 
     Mais preciso que fixed window, evita bursts no limite da janela.
+    Cada janela (minuto/hora) é um deque ordenado por timestamp: a expiração
+    remove do início (popleft) e a contagem é len(), sem reconstruir listas.
     """
 
     def __init__(self, config: Optional[RateLimitConfig] = None):
         self.config = config or RateLimitConfig()
-        self._requests: dict[str, list[float]] = defaultdict(list)
+        self._minute: dict[str, deque[float]] = defaultdict(deque)
+        self._hour: dict[str, deque[float]] = defaultdict(deque)
         self._lock = threading.RLock()
 
-    def _cleanup_old_requests(self, key: str, window_seconds: int) -> None:
-        """Remove requisições antigas da janela."""
-        cutoff = time.time() - window_seconds
-        self._requests[key] = [t for t in self._requests[key] if t > cutoff]
+    @staticmethod
+    def _evict(window: deque[float], cutoff: float) -> None:
+        """Remove timestamps fora da janela."""
+        while window and window[0] <= cutoff:
+            window.popleft()
 
     def check(self, key: str) -> RateLimitResult:
         """
@@ -68,18 +72,17 @@ class SlidingWindowRateLimiter:
         with self._lock:
             now = time.time()
 
-            # Limpar requisições antigas (janela de 1 hora)
-            self._cleanup_old_requests(key, 3600)
-
-            requests = self._requests[key]
+            minute = self._minute[key]
+            hour = self._hour[key]
+            self._evict(minute, now - 60)
+            self._evict(hour, now - 3600)
 
             # Verificar limite por minuto
-            minute_ago = now - 60
-            requests_last_minute = sum(1 for t in requests if t > minute_ago)
+            requests_last_minute = len(minute)
 
             if requests_last_minute >= self.config.requests_per_minute:
                 # Calcular quando poderá tentar novamente
-                oldest_in_minute = min((t for t in requests if t > minute_ago), default=now)
+                oldest_in_minute = minute[0]
                 retry_after = int(60 - (now - oldest_in_minute)) + 1
 
                 return RateLimitResult(
@@ -90,11 +93,10 @@ class SlidingWindowRateLimiter:
                 )
 
             # Verificar limite por hora
-            hour_ago = now - 3600
-            requests_last_hour = sum(1 for t in requests if t > hour_ago)
+            requests_last_hour = len(hour)
 
             if requests_last_hour >= self.config.requests_per_hour:
-                oldest_in_hour = min((t for t in requests if t > hour_ago), default=now)
+                oldest_in_hour = hour[0]
                 retry_after = int(3600 - (now - oldest_in_hour)) + 1
 
                 return RateLimitResult(
@@ -105,7 +107,8 @@ class SlidingWindowRateLimiter:
                 )
 
             # Permitido - registrar requisição
-            requests.append(now)
+            minute.append(now)
+            hour.append(now)
 
             remaining = min(
                 self.config.requests_per_minute - requests_last_minute - 1,
@@ -121,21 +124,23 @@ class SlidingWindowRateLimiter:
     def reset(self, key: str) -> None:
         """Reseta contadores para uma chave."""
         with self._lock:
-            if key in self._requests:
-                del self._requests[key]
+            self._minute.pop(key, None)
+            self._hour.pop(key, None)
 
     def get_stats(self, key: str) -> dict:
         """Retorna estatísticas para uma chave."""
         with self._lock:
             now = time.time()
-            requests = self._requests.get(key, [])
-
-            minute_ago = now - 60
-            hour_ago = now - 3600
+            minute = self._minute.get(key)
+            hour = self._hour.get(key)
+            if minute is not None:
+                self._evict(minute, now - 60)
+            if hour is not None:
+                self._evict(hour, now - 3600)
 
             return {
-                "requests_last_minute": sum(1 for t in requests if t > minute_ago),
-                "requests_last_hour": sum(1 for t in requests if t > hour_ago),
+                "requests_last_minute": len(minute) if minute is not None else 0,
+                "requests_last_hour": len(hour) if hour is not None else 0,
                 "limit_per_minute": self.config.requests_per_minute,
                 "limit_per_hour": self.config.requests_per_hour,
             }
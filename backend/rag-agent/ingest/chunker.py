@@ -382,7 +382,7 @@ def reindex_documents(db_path: str, chunker: Chunker) -> dict:
         # Gerar embeddings para cada chunk
         for chunk in chunks:
             embeddings = list(model.embed([chunk.text]))
-            embedding_bytes = sqlite_vec.serialize_float32(embeddings[0].tolist())
+            embedding_bytes = embeddings[0].astype("float32", copy=False).tobytes()
 
             # Inserir ou atualizar embedding
             # Nota: Em produção, você criaria uma tabela separada para chunks
@@ -9,14 +9,16 @@ from pathlib import Path
 from typing import Optional, List
 import apsw
 import sqlite_vec
-from fastembed import TextEmbedding
 from dataclasses import dataclass
 
 # Adicionar parent ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from ingest.chunker import Chunker, ChunkingStrategy, Chunk
-from core.config import get_config
+from core.embedding_model import get_embedding_model
+from core.config import get_config, vector_param, bump_data_version, RESCORE_TABLE, RESCORE_TABLE_DDL
+from core.connection_pool import BUSY_TIMEOUT_MS
+from core.ivf_index import add_to_ivf_index, ivf_is_current, mark_ivf_current
 from core.logger import logger
 
 
@@ -73,11 +75,12 @@ class IngestionPipeline:
             chunking=self.chunking_strategy.value,
             chunk_size=self.chunk_size,
         )
-        self.model = TextEmbedding(self.config.embedding_model.value)
+        self.model = get_embedding_model()
 
     def get_connection(self):
         """Cria conexão com sqlite-vec."""
         conn = apsw.Connection(self.db_path)
+        conn.setbusytimeout(BUSY_TIMEOUT_MS)
         conn.enableloadextension(True)
         conn.loadextension(sqlite_vec.loadable_path())
         conn.enableloadextension(False)
@@ -138,19 +141,41 @@ class IngestionPipeline:
             # Por enquanto, vamos usar apenas o primeiro chunk como representativo
             # ou fazer uma média dos embeddings
             if len(embeddings) == 1:
-                final_embedding = embeddings[0].tolist()
+                final_embedding = embeddings[0]
             else:
-                # Média dos embeddings dos chunks
+                # Média dos embeddings dos chunks (vetorizada, sem listas Python)
                 import numpy as np
-                final_embedding = np.mean([e.tolist() for e in embeddings], axis=0).tolist()
+                final_embedding = np.mean(np.stack(embeddings), axis=0)
 
-            embedding_bytes = sqlite_vec.serialize_float32(final_embedding)
+            embedding_bytes = final_embedding.astype("float32", copy=False).tobytes()
 
-            # Inserir ou atualizar embedding
-            cursor.execute("""
-                INSERT OR REPLACE INTO vec_documentos (doc_id, embedding)
-                VALUES (?, ?)
-            """, (doc_id, embedding_bytes))
+            # Escritas e versões em uma transação
+            with conn:
+                # Índice IVF em dia antes desta escrita continua em dia depois
+                ivf_current = ivf_is_current(cursor)
+
+                # Inserir ou atualizar embedding (quantizado pelo sqlite-vec se int8)
+                cursor.execute(f"""
+                    INSERT OR REPLACE INTO vec_documentos (doc_id, embedding)
+                    VALUES (?, {vector_param(self.config.embedding_quantization)})
+                """, (doc_id, embedding_bytes))
+
+                # Cópia float32 para o re-score dos candidatos int8
+                if self.config.rescore_enabled:
+                    cursor.execute(RESCORE_TABLE_DDL)
+                    cursor.execute(
+                        f"INSERT OR REPLACE INTO {RESCORE_TABLE} (doc_id, embedding) VALUES (?, ?)",
+                        (doc_id, embedding_bytes),
+                    )
+
+                # Vetor no cluster mais próximo (se o índice IVF existir)
+                ivf_updated = add_to_ivf_index(cursor, doc_id, embedding_bytes)
+
+                # Invalida caches de leitura do MCP server (documentos, BM25)
+                bump_data_version(cursor)
+
+                if ivf_current and ivf_updated:
+                    mark_ivf_current(cursor)
 
             conn.close()
 
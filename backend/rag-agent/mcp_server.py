@@ -6,11 +6,14 @@
 # reranking, circuit breaker, prompt guard, RBAC
 # =============================================================================
 
+import asyncio
+import os
+import struct
 import time
-from mcp.server.fastmcp import FastMCP
-from fastembed import TextEmbedding
+from dataclasses import dataclass
 import apsw
-import sqlite_vec
+import numpy as np
+from mcp.server.fastmcp import FastMCP
 from pathlib import Path
 from typing import Optional
 
@@ -19,14 +22,20 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent))
 
 from core.logger import logger, set_request_id, set_conversation_id
-from core.cache import get_embedding_cache, get_response_cache
+from core.cache import get_embedding_cache, get_response_cache, get_semantic_cache, get_document_cache
 from core.circuit_breaker import get_or_create_circuit_breaker, CircuitBreakerError
 from core.prompt_guard import get_prompt_guard, ThreatLevel
 from core.reranker import LightweightReranker
-from core.config import get_config
+from core.config import get_config, vector_param, distance_scale, RESCORE_TABLE, DATA_VERSION_SQL, INT8_UNIT_SCALE
+from core.hybrid_search import HybridSearch
 from core.adaptive_search import apply_adaptive_topk
+from core.embedding_batcher import EmbeddingBatcher
+from core.embedding_model import get_embedding_model
+from core.connection_pool import get_connection_pool
+from core.ivf_index import ivf_search, ivf_is_current
 from core.sync_audit import audit_sync_tool, get_audit_queue
 from api.metrics import get_metrics
+from api.health import HealthChecker
 
 # Carregar configuração
 config = get_config()
@@ -37,8 +46,11 @@ DB_PATH = config.db_path
 # Inicializar MCP Server
 mcp = FastMCP("rag-tools")
 
-# Modelo de embeddings (carregado da config)
-model = TextEmbedding(config.embedding_model.value)
+# Modelo de embeddings (carregado da config; threads ajustadas + warmup)
+model = get_embedding_model()
+
+# Micro-batcher: queries concorrentes compartilham um único model.embed()
+embedding_batcher = EmbeddingBatcher(lambda texts: list(model.embed(texts)))
 
 # Coletor de métricas
 metrics = get_metrics()
@@ -49,6 +61,12 @@ embedding_cache = get_embedding_cache()
 # Cache de respostas
 response_cache = get_response_cache()
 
+# Cache semântico (queries equivalentes por similaridade de embedding)
+semantic_cache = get_semantic_cache()
+
+# Cache de documentos (get_document, list_sources), invalidado pela versão dos dados
+document_cache = get_document_cache()
+
 # Circuit breaker para operações de DB
 db_circuit = get_or_create_circuit_breaker("database", failure_threshold=3, timeout=30.0)
 
@@ -58,36 +76,272 @@ prompt_guard = get_prompt_guard(strict_mode=False)
 # Reranker
 reranker = LightweightReranker()
 
+# Health checker único: uptime conta desde o start e o modelo é compartilhado
+health_checker = HealthChecker(str(DB_PATH), model=model)
+
+
+# Pool de conexões (sqlite-vec carregado uma vez por conexão)
+db_pool = get_connection_pool(DB_PATH)
+
+
+
+def data_version(cursor) -> int:
+    """Versão atual dos dados (0 se o banco nunca passou pela ingestão)."""
+    try:
+        row = cursor.execute(DATA_VERSION_SQL).fetchone()
+    except apsw.SQLError:
+        return 0  # Tabela rag_meta ainda não existe
+    return row[0] if row else 0
+
+
+# Busca híbrida: índice BM25 construído na primeira chamada e refeito só
+# quando a versão dos dados muda
+_hybrid_search: Optional[HybridSearch] = None
+_hybrid_version = 0
+
+
+def get_hybrid_search() -> HybridSearch:
+    """Retorna instância global de HybridSearch (recriada se os dados mudaram)."""
+    global _hybrid_search, _hybrid_version
+    with db_pool.acquire() as conn:
+        version = data_version(conn.cursor())
+
+    if _hybrid_search is None or version != _hybrid_version:
+        _hybrid_search = HybridSearch(str(DB_PATH))
+        _hybrid_version = version
+    return _hybrid_search
+
+
+# SQL das tools (texto fixo: reaproveitado pelo cache de statements do apsw)
+# Conteúdo truncado (e NULL -> "") no SQLite: só os primeiros 1000 caracteres
+# chegam ao Python
+# Com int8, a query float32 é quantizada no próprio MATCH
+# KNN isolado em CTE: o join com documentos só toca as k linhas vencedoras
+SEARCH_SQL = f"""
+    WITH hits AS (
+        SELECT doc_id, distance
+        FROM vec_documentos
+        WHERE embedding MATCH {vector_param(config.embedding_quantization)} AND k = ?
+    )
+    SELECT h.doc_id, h.distance, d.nome, SUBSTR(COALESCE(d.conteudo, ''), 1, 1000), d.tipo
+    FROM hits h
+    JOIN documentos d ON d.id = h.doc_id
+    ORDER BY h.distance
+"""
+
+# Distância int8 volta para a escala float antes de virar similaridade
+DISTANCE_SCALE = distance_scale(config.embedding_quantization)
+
+def rescore_table_exists() -> bool:
+    """Tabela de cópias float32 existe? (sem ela o re-score não tem o que ler)"""
+    try:
+        with db_pool.acquire() as conn:
+            row = conn.cursor().execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (RESCORE_TABLE,)
+            ).fetchone()
+    except apsw.Error:
+        return False
+    return row is not None
+
+
+RESCORE_ENABLED = config.rescore_enabled
+if RESCORE_ENABLED and not rescore_table_exists():
+    RESCORE_ENABLED = False
+    logger.warning(
+        "rescore_disabled",
+        reason=f"tabela {RESCORE_TABLE} ausente",
+        hint="reingerir com EMBEDDING_RESCORE_FACTOR > 0 e reiniciar",
+    )
+
+# int8 + re-score: MATCH int8 traz k*N candidatos, distância final em float32.
+# LEFT JOIN: documento sem cópia float32 (ingerido com re-score desligado)
+# continua no resultado com a distância int8 reescalada
+if RESCORE_ENABLED:
+    SEARCH_SQL = f"""
+        WITH hits AS (
+            SELECT doc_id, distance
+            FROM vec_documentos
+            WHERE embedding MATCH {vector_param(config.embedding_quantization)} AND k = ?
+        )
+        SELECT h.doc_id,
+               CASE WHEN f.embedding IS NULL THEN h.distance / {INT8_UNIT_SCALE}
+                    ELSE vec_distance_l2(f.embedding, ?) END AS distance,
+               d.nome, SUBSTR(COALESCE(d.conteudo, ''), 1, 1000), d.tipo
+        FROM hits h
+        LEFT JOIN {RESCORE_TABLE} f ON f.doc_id = h.doc_id
+        JOIN documentos d ON d.id = h.doc_id
+        ORDER BY distance
+        LIMIT ?
+    """
+    DISTANCE_SCALE = 1.0
+
+
+# Índice IVF (aproximado): vetores float32 agrupados por cluster
+IVF_DISTANCE_SCALE = 1.0
+
+DOCUMENTS_BY_ID_SQL = """
+    SELECT id, nome, SUBSTR(COALESCE(conteudo, ''), 1, 1000), tipo
+    FROM documentos
+    WHERE id IN ({placeholders})
+"""
+
+
+def ivf_rows(cursor, query_vec: bytes, k: int) -> list[tuple]:
+    """Mesmas colunas de SEARCH_SQL, via índice IVF (só clusters mais próximos)."""
+    hits = ivf_search(cursor, query_vec, k, config.ivf_probes)
+    if not hits:
+        return []
+
+    sql = DOCUMENTS_BY_ID_SQL.format(placeholders=",".join("?" * len(hits)))
+    docs = {row[0]: row[1:] for row in cursor.execute(sql, [doc_id for doc_id, _ in hits])}
+    return [(doc_id, distance, *docs[doc_id]) for doc_id, distance in hits if doc_id in docs]
+
+
+# Versão dos dados do último aviso de IVF ausente/defasado (um aviso por versão)
+_ivf_warned_version: Optional[int] = None
+
+
+def use_ivf(cursor) -> bool:
+    """IVF só se construído e em dia com os dados; senão busca exata com aviso."""
+    global _ivf_warned_version
+    if config.ivf_probes <= 0:
+        return False
+    if ivf_is_current(cursor):
+        return True
+
+    version = data_version(cursor)
+    if version != _ivf_warned_version:
+        _ivf_warned_version = version
+        logger.warning(
+            "ivf_index_unavailable",
+            data_version=version,
+            fallback="exact_search",
+            hint="rodar scripts/build_ivf_index.py",
+        )
+    return False
+
+
+def search_params(query_vec: bytes, k: int) -> tuple:
+    """Parâmetros de SEARCH_SQL para o formato configurado."""
+    if RESCORE_ENABLED:
+        return (query_vec, k * config.embedding_rescore_factor, query_vec, k)
+    return (query_vec, k)
 
-def get_connection():
-    """Cria conexao com sqlite-vec carregado usando apsw."""
-    conn = apsw.Connection(str(DB_PATH))
-    conn.enableloadextension(True)
-    conn.loadextension(sqlite_vec.loadable_path())
-    conn.enableloadextension(False)
-    return conn
+GET_DOCUMENT_SQL = """
+    SELECT id, nome, tipo, conteudo, caminho, criado_em
+    FROM documentos
+    WHERE id = ?
+"""
 
+LIST_SOURCES_SQL = """
+    SELECT id, nome, tipo, LENGTH(conteudo) as tamanho
+    FROM documentos
+    ORDER BY nome
+"""
 
-def serialize_embedding(embedding: list) -> bytes:
-    """Converte lista de floats para bytes usando sqlite_vec."""
-    return sqlite_vec.serialize_float32(embedding)
+# vec_documentos_rowids é a shadow table do vec0 (uma linha por vetor, sem
+# blobs): contar nela não percorre as páginas dos chunks de embeddings
+COUNT_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM documentos),
+        (SELECT COUNT(*) FROM vec_documentos_rowids)
+"""
 
 
-def get_embedding_cached(text: str) -> list[float]:
-    """Obtém embedding com cache."""
+# Packer especializado na dimensão do modelo (compilado uma vez)
+EMBEDDING_PACKER = struct.Struct(f"<{config.embedding_dimensions}f")
+
+
+def serialize_embedding(embedding) -> bytes:
+    """
+    Converte vetor para o formato do sqlite-vec (float32 little-endian).
+
+    ndarray (FastEmbed): o buffer do array já é o formato, sem passar por
+    lista Python. Listas usam o packer de tamanho fixo.
+    """
+    if isinstance(embedding, list):
+        return EMBEDDING_PACKER.pack(*embedding)
+    return embedding.astype("<f4", copy=False).tobytes()
+
+
+@dataclass(slots=True)
+class SearchHit:
+    """
+    Resultado de search_documents no hot path.
+
+    Atravessa adaptive top-k (usa .similarity) e reranking (vai como metadata)
+    sem virar dict; a conversão acontece uma vez, em to_dict(), na resposta.
+    """
+    doc_id: int
+    source: str
+    type: str
+    content: str
+    similarity: float
+    rerank_score: Optional[float] = None
+    rank: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        """Formato de resposta da tool."""
+        result = {
+            "doc_id": self.doc_id,
+            "source": self.source,
+            "type": self.type,
+            "content": self.content,
+            "similarity": self.similarity,
+        }
+        if self.rank is not None:
+            result["rerank_score"] = self.rerank_score
+            result["rank"] = self.rank
+        return result
+
+
+async def get_embedding_cached(text: str) -> bytes:
+    """
+    Obtém embedding já serializado (float32) com cache.
+
+    Misses passam pelo micro-batcher; hits não re-serializam o vetor.
+    """
     cached = embedding_cache.get(text)
     if cached is not None:
         return cached
 
-    embeddings = list(model.embed([text]))
-    embedding = embeddings[0].tolist()
-    embedding_cache.set(text, embedding)
-    return embedding
+    query_vec = serialize_embedding(await embedding_batcher.embed(text))
+    embedding_cache.set(text, query_vec)
+    return query_vec
+
+
+def do_search(query_vec: bytes, fetch_k: int) -> list[SearchHit]:
+    """
+    KNN no banco (roda em thread, via circuit breaker).
+
+    Fica no nível do módulo e recebe tudo por parâmetro: sem closure recriada
+    a cada query.
+    """
+    with db_pool.acquire() as conn:
+        cursor = conn.cursor()
+        if use_ivf(cursor):
+            rows = ivf_rows(cursor, query_vec, fetch_k)
+            scale = IVF_DISTANCE_SCALE
+        else:
+            rows = cursor.execute(SEARCH_SQL, search_params(query_vec, fetch_k)).fetchall()
+            scale = DISTANCE_SCALE
+
+    if not rows:
+        return []
+
+    # Similaridades de todas as linhas em uma operação vetorizada
+    distances = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+    similarities = np.clip(1 - distances / scale, 0, None).round(3).tolist()
+
+    return [
+        SearchHit(doc_id, nome, tipo, conteudo, similarity)
+        for (doc_id, _, nome, conteudo, tipo), similarity in zip(rows, similarities)
+    ]
 
 
 @mcp.tool()
 @audit_sync_tool("search_documents")
-def search_documents(query: str, top_k: int = 5, use_reranking: bool = True, use_adaptive: bool = True) -> list:
+async def search_documents(query: str, top_k: int = 5, use_reranking: bool = True, use_adaptive: bool = True) -> list:
     """
     Busca semantica nos documentos indexados.
 
@@ -101,9 +355,18 @@ def search_documents(query: str, top_k: int = 5, use_reranking: bool = True, use
         Lista de documentos relevantes com source, content e score
     """
     request_id = set_request_id()
-    start_time = time.perf_counter()
+    start_ns = time.perf_counter_ns()
 
     try:
+        # Verificar cache de resposta primeiro: só queries aprovadas pelo guard
+        # entram no cache, então um hit dispensa o scan
+        cached_response = response_cache.get(
+            query, top_k, use_reranking=use_reranking, use_adaptive=use_adaptive
+        )
+        if cached_response:
+            logger.info("cache_hit", query=query[:50], use_reranking=use_reranking)
+            return cached_response
+
         # Verificar prompt injection
         scan_result = prompt_guard.scan(query)
         if not scan_result.is_safe:
@@ -119,48 +382,23 @@ def search_documents(query: str, top_k: int = 5, use_reranking: bool = True, use
                 "threat_level": scan_result.threat_level.value,
             }]
 
-        # Verificar cache de resposta (incluindo use_reranking na chave)
-        cached_response = response_cache.get(query, top_k, use_reranking=use_reranking)
-        if cached_response:
-            logger.info("cache_hit", query=query[:50], use_reranking=use_reranking)
-            return cached_response
-
-        # Usar circuit breaker para operação de DB
-        def do_search():
-            # Gerar embedding com cache
-            embedding = get_embedding_cached(query)
-            query_vec = serialize_embedding(embedding)
+        # Gerar embedding com cache (agrupado com queries concorrentes)
+        query_vec = await get_embedding_cached(query)
 
-            conn = get_connection()
-            cursor = conn.cursor()
+        # Verificar cache semântico (query equivalente já respondida). Só sem
+        # re-ranking: a ordem do reranker depende do texto exato da query
+        if not use_reranking:
+            semantic_hit = semantic_cache.get(query_vec, top_k=top_k, use_adaptive=use_adaptive)
+            if semantic_hit is not None:
+                logger.info("semantic_cache_hit", query=query[:50], use_reranking=use_reranking)
+                return semantic_hit
 
-            # Buscar mais resultados para re-ranking
-            fetch_k = top_k * 2 if use_reranking else top_k
+        # Buscar mais resultados para re-ranking
+        fetch_k = top_k * 2 if use_reranking else top_k
 
-            results = []
-            for row in cursor.execute("""
-                SELECT v.doc_id, v.distance, d.nome, d.conteudo, d.tipo
-                FROM vec_documentos v
-                JOIN documentos d ON d.id = v.doc_id
-                WHERE v.embedding MATCH ? AND k = ?
-            """, (query_vec, fetch_k)):
-                doc_id, distance, nome, conteudo, tipo = row
-                similarity = max(0, 1 - distance)
-
-                results.append({
-                    "doc_id": doc_id,
-                    "source": nome,
-                    "type": tipo,
-                    "content": conteudo[:1000] if conteudo else "",
-                    "similarity": round(similarity, 3)
-                })
-
-            conn.close()
-            return results
-
-        # Executar com circuit breaker
+        # Executar com circuit breaker (em thread, sem bloquear o event loop)
         try:
-            results = db_circuit.call(do_search)
+            results = await asyncio.to_thread(db_circuit.call, do_search, query_vec, fetch_k)
         except CircuitBreakerError as e:
             logger.log_error("CircuitBreakerOpen", str(e))
             metrics.record_error("CircuitBreakerOpen")
@@ -168,14 +406,7 @@ def search_documents(query: str, top_k: int = 5, use_reranking: bool = True, use
 
         # Aplicar top-k adaptativo ANTES do reranking
         if use_adaptive and len(results) > 0:
-            # Criar objetos mock com similarity para adaptive
-            from dataclasses import dataclass
-            @dataclass
-            class MockResult:
-                similarity: float
-
-            mock_results = [MockResult(similarity=r["similarity"]) for r in results]
-            _, adaptive_decision = apply_adaptive_topk(mock_results, top_k, enabled=True)
+            _, adaptive_decision = apply_adaptive_topk(results, top_k, enabled=True)
 
             # Ajustar fetch_k baseado na decisão adaptativa
             adaptive_k = adaptive_decision.adjusted_k
@@ -198,45 +429,46 @@ def search_documents(query: str, top_k: int = 5, use_reranking: bool = True, use
 
         # Aplicar re-ranking se habilitado
         if use_reranking and len(results) > 0:
-            docs_for_rerank = [
-                (r["doc_id"], r["content"], r["similarity"], {"source": r["source"], "type": r["type"]})
-                for r in results
-            ]
+            # O próprio hit vai como metadata: volta do reranker sem cópia
+            docs_for_rerank = [(r.doc_id, r.content, r.similarity, r) for r in results]
             # Usar adaptive_k como limite do reranking
             reranked = reranker.rerank(query, docs_for_rerank, top_k=adaptive_k)
 
-            results = [
-                {
-                    "doc_id": r.doc_id,
-                    "source": r.metadata["source"],
-                    "type": r.metadata["type"],
-                    "content": r.content,
-                    "similarity": r.original_score,
-                    "rerank_score": r.rerank_score,
-                    "rank": r.final_rank,
-                }
-                for r in reranked
-            ]
-
-        # Calcular latencia
-        latency_ms = (time.perf_counter() - start_time) * 1000
+            results = []
+            for r in reranked:
+                hit = r.metadata
+                hit.rerank_score = r.rerank_score
+                hit.rank = r.final_rank
+                results.append(hit)
+
+        # Calcular latencia (ns inteiros; ms só na fronteira das métricas)
+        latency_ns = time.perf_counter_ns() - start_ns
 
         # Registrar metricas
-        metrics.record_query(latency_ms, len(results))
+        metrics.record_query(latency_ns / 1_000_000, len(results))
+
+        # Log estruturado (evento único: query + documentos recuperados)
+        logger.log_search(
+            query,
+            top_k,
+            [r.doc_id for r in results],
+            [r.similarity for r in results],
+            latency_ns,
+        )
 
-        # Log estruturado
-        doc_ids = [r["doc_id"] for r in results]
-        similarities = [r["similarity"] for r in results]
-        logger.log_query(query, top_k, len(results), latency_ms)
-        logger.log_retrieval(doc_ids, similarities, latency_ms)
+        # Conversão para dict só na fronteira da resposta
+        response = [r.to_dict() for r in results]
 
-        # Salvar em cache (incluindo use_reranking na chave)
-        response_cache.set(query, top_k, results, use_reranking=use_reranking)
+        # Salvar em cache (parâmetros que mudam o resultado entram na chave)
+        response_cache.set(
+            query, top_k, response, use_reranking=use_reranking, use_adaptive=use_adaptive
+        )
+        if not use_reranking:
+            semantic_cache.set(query_vec, response, top_k=top_k, use_adaptive=use_adaptive)
 
-        return results
+        return response
 
     except Exception as e:
-        latency_ms = (time.perf_counter() - start_time) * 1000
         metrics.record_error(type(e).__name__)
         logger.log_error(type(e).__name__, str(e), query=query[:100])
         raise
@@ -256,8 +488,6 @@ def search_hybrid(query: str, top_k: int = 5, vector_weight: float = 0.7) -> lis
     Returns:
         Lista de documentos com scores hibridos
     """
-    from core.hybrid_search import HybridSearch
-
     request_id = set_request_id()
     start_time = time.perf_counter()
 
@@ -268,14 +498,21 @@ def search_hybrid(query: str, top_k: int = 5, vector_weight: float = 0.7) -> lis
             metrics.record_error("PromptInjectionBlocked")
             return [{"error": "Query blocked by security filter"}]
 
-        # Busca hibrida
-        hybrid = HybridSearch(
-            str(DB_PATH),
-            vector_weight=vector_weight,
-            bm25_weight=1 - vector_weight,
-        )
+        # Busca hibrida (instância única; peso vetorial por chamada)
+        hybrid = get_hybrid_search()
 
-        results = hybrid.search(query, top_k=top_k)
+        # Embedding fora do circuit breaker: lentidão do modelo não conta
+        # como falha do banco
+        query_vec = hybrid.embed_query(query)
+
+        try:
+            results = db_circuit.call(
+                hybrid.search, query, top_k=top_k, vector_weight=vector_weight, query_vec=query_vec,
+            )
+        except CircuitBreakerError as e:
+            logger.log_error("CircuitBreakerOpen", str(e))
+            metrics.record_error("CircuitBreakerOpen")
+            return [{"error": "Service temporarily unavailable", "retry_after": 30}]
 
         # Converter para formato de resposta
         response = [
@@ -300,7 +537,6 @@ def search_hybrid(query: str, top_k: int = 5, vector_weight: float = 0.7) -> lis
         return response
 
     except Exception as e:
-        latency_ms = (time.perf_counter() - start_time) * 1000
         metrics.record_error(type(e).__name__)
         logger.log_error(type(e).__name__, str(e), query=query[:100])
         raise
@@ -319,20 +555,17 @@ def get_document(doc_id: int) -> dict:
         Documento completo com todos os campos
     """
     def fetch_doc():
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        row = None
-        for r in cursor.execute("""
-            SELECT id, nome, tipo, conteudo, caminho, criado_em
-            FROM documentos
-            WHERE id = ?
-        """, (doc_id,)):
-            row = r
-            break
-
-        conn.close()
-        return row
+        with db_pool.acquire() as conn:
+            cursor = conn.cursor()
+            # Uma leitura de int decide se o cache ainda vale
+            version = data_version(cursor)
+            key = f"doc:{doc_id}"
+            row = document_cache.get(key, version)
+            if row is None:
+                row = cursor.execute(GET_DOCUMENT_SQL, (doc_id,)).fetchone()
+                if row:
+                    document_cache.set(key, version, row)
+            return row
 
     try:
         row = db_circuit.call(fetch_doc)
@@ -362,19 +595,17 @@ def list_sources() -> list:
         Lista de documentos com nome e tipo
     """
     def fetch_sources():
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        results = [
-            {"id": r[0], "nome": r[1], "tipo": r[2], "tamanho": r[3]}
-            for r in cursor.execute("""
-                SELECT id, nome, tipo, LENGTH(conteudo) as tamanho
-                FROM documentos
-                ORDER BY nome
-            """)
-        ]
+        with db_pool.acquire() as conn:
+            cursor = conn.cursor()
+            version = data_version(cursor)
+            results = document_cache.get("sources", version)
+            if results is None:
+                results = [
+                    {"id": r[0], "nome": r[1], "tipo": r[2], "tamanho": r[3]}
+                    for r in cursor.execute(LIST_SOURCES_SQL)
+                ]
+                document_cache.set("sources", version, results)
 
-        conn.close()
         return results
 
     try:
@@ -393,18 +624,9 @@ def count_documents() -> dict:
         Estatisticas do banco
     """
     def count():
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        total_docs = 0
-        for r in cursor.execute("SELECT COUNT(*) FROM documentos"):
-            total_docs = r[0]
-
-        total_embeddings = 0
-        for r in cursor.execute("SELECT COUNT(*) FROM vec_documentos"):
-            total_embeddings = r[0]
-
-        conn.close()
+        # Uma única ida ao SQLite para as duas contagens
+        with db_pool.acquire() as conn:
+            total_docs, total_embeddings = conn.cursor().execute(COUNT_SQL).fetchone()
 
         return {
             "total_documentos": total_docs,
@@ -432,6 +654,7 @@ def get_metrics_summary() -> dict:
     # Incluir stats de cache
     emb_cache_stats = embedding_cache.stats
     resp_cache_stats = response_cache.stats
+    sem_cache_stats = semantic_cache.stats
 
     return {
         "uptime_seconds": all_metrics["uptime_seconds"],
@@ -451,6 +674,11 @@ def get_metrics_summary() -> dict:
                 "misses": resp_cache_stats.misses,
                 "hit_rate": round(resp_cache_stats.hit_rate, 2),
             },
+            "semantic": {
+                "hits": sem_cache_stats.hits,
+                "misses": sem_cache_stats.misses,
+                "hit_rate": round(sem_cache_stats.hit_rate, 2),
+            },
         },
         "circuit_breaker": {
             "state": db_circuit.state.value,
@@ -473,10 +701,7 @@ def get_health() -> dict:
     Returns:
         Health check com status de todos os componentes
     """
-    from api.health import HealthChecker
-
-    checker = HealthChecker(str(DB_PATH))
-    report = checker.check_health(include_details=False)
+    report = health_checker.check_health(include_details=False)
 
     return {
         "status": report.status.value,
@@ -511,7 +736,7 @@ def clear_cache(cache_type: str = "all") -> dict:
     Limpa cache de embeddings ou respostas.
 
     Args:
-        cache_type: Tipo de cache ("embedding", "response", ou "all")
+        cache_type: Tipo de cache ("embedding", "response", "semantic", "document" ou "all")
 
     Returns:
         Estatisticas de limpeza
@@ -536,6 +761,24 @@ def clear_cache(cache_type: str = "all") -> dict:
             "memory_freed_mb": round(resp_stats_before.memory_bytes / 1024 / 1024, 2),
         })
 
+    if cache_type in ("semantic", "all"):
+        sem_stats_before = semantic_cache.stats
+        semantic_cache.clear()
+        result["cleared"].append({
+            "type": "semantic",
+            "entries_cleared": sem_stats_before.size,
+            "memory_freed_mb": round(sem_stats_before.memory_bytes / 1024 / 1024, 2),
+        })
+
+    if cache_type in ("document", "all"):
+        doc_stats_before = document_cache.stats
+        document_cache.clear()
+        result["cleared"].append({
+            "type": "document",
+            "entries_cleared": doc_stats_before.size,
+            "memory_freed_mb": round(doc_stats_before.memory_bytes / 1024 / 1024, 2),
+        })
+
     result["status"] = "success"
     return result
 
@@ -557,9 +800,6 @@ async def create_file(path: str, content: str) -> dict:
     Returns:
         Informações sobre o arquivo criado
     """
-    from pathlib import Path
-    import os
-
     storage_type = "local"
 
     try:
@@ -603,8 +843,6 @@ async def read_file(path: str) -> dict:
     Returns:
         Conteúdo do arquivo
     """
-    from pathlib import Path
-
     try:
         # Primeiro tenta ler como caminho absoluto
         file_path = Path(path)
@@ -646,9 +884,6 @@ async def list_files(directory: str = "/") -> dict:
     Returns:
         Lista de arquivos e diretórios
     """
-    from pathlib import Path
-    import os
-
     try:
         # Determina pasta de outputs da sessão
         session_file = Path.home() / ".claude" / ".agentfs" / "current_session"
@@ -702,8 +937,6 @@ async def delete_file(path: str) -> dict:
     Returns:
         Status da operação
     """
-    from pathlib import Path
-
     try:
         # Determina pasta de outputs da sessão
         session_file = Path.home() / ".claude" / ".agentfs" / "current_session"
@@ -737,8 +970,6 @@ async def get_file_info(path: str) -> dict:
     Returns:
         Metadados do arquivo
     """
-    from pathlib import Path
-
     try:
         # Determina pasta de outputs da sessão
         session_file = Path.home() / ".claude" / ".agentfs" / "current_session"
@@ -7,7 +7,7 @@
 # =============================================================================
 
 import asyncio
-from claude_agent_sdk import query, AssistantMessage, TextBlock, ToolUseBlock, ResultMessage
+from claude_agent_sdk import query, ClaudeSDKClient, AssistantMessage, TextBlock, ToolUseBlock, ResultMessage
 from config import RAG_AGENT_OPTIONS
 
 
@@ -40,34 +40,37 @@ async def interactive_mode():
     print("Digite suas perguntas sobre IA em grandes empresas.")
     print("Digite 'sair' para encerrar.\n")
 
-    while True:
-        try:
-            question = input("\nVoce: ").strip()
+    # Uma unica sessao (processo CLI) reutilizada entre perguntas
+    async with ClaudeSDKClient(options=RAG_AGENT_OPTIONS) as client:
+        while True:
+            try:
+                question = input("\nVoce: ").strip()
 
-            if not question:
-                continue
+                if not question:
+                    continue
 
-            if question.lower() in ['sair', 'exit', 'quit']:
-                print("\nEncerrando...")
-                break
+                if question.lower() in ['sair', 'exit', 'quit']:
+                    print("\nEncerrando...")
+                    break
 
-            print("\nAgente: ", end="", flush=True)
+                print("\nAgente: ", end="", flush=True)
 
-            async for message in query(prompt=question, options=RAG_AGENT_OPTIONS):
-                if isinstance(message, AssistantMessage):
-                    for block in message.content:
-                        if isinstance(block, TextBlock):
-                            print(block.text, end="", flush=True)
-                        elif isinstance(block, ToolUseBlock):
-                            print(f"\n[Usando tool: {block.name}]", flush=True)
+                await client.query(question)
+                async for message in client.receive_response():
+                    if isinstance(message, AssistantMessage):
+                        for block in message.content:
+                            if isinstance(block, TextBlock):
+                                print(block.text, end="", flush=True)
+                            elif isinstance(block, ToolUseBlock):
+                                print(f"\n[Usando tool: {block.name}]", flush=True)
 
-            print()  # Nova linha no final
+                print()  # Nova linha no final
 
-        except KeyboardInterrupt:
-            print("\n\nInterrompido pelo usuario.")
-            break
-        except Exception as e:
-            print(f"\nErro: {e}")
+            except KeyboardInterrupt:
+                print("\n\nInterrompido pelo usuario.")
+                break
+            except Exception as e:
+                print(f"\nErro: {e}")
 
 
 async def streaming_question(question: str):
@@ -87,8 +90,24 @@ async def streaming_question(question: str):
     print("\n" + "-" * 40)
 
 
+async def ask_questions(questions: list[str], concurrency: int = 3) -> list[str]:
+    """
+    Envia varias perguntas em paralelo (limitado por semaforo).
+
+    Returns:
+        Respostas na mesma ordem das perguntas
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def ask(question: str) -> str:
+        async with semaphore:
+            return await ask_question(question)
+
+    return await asyncio.gather(*(ask(q) for q in questions))
+
+
 def test_questions():
-    """Testa com as perguntas do desafio Atlantyx."""
+    """Testa com as perguntas do desafio Atlantyx (executadas em paralelo)."""
     questions = [
         "Quais sao os principios obrigatorios da Politica de Uso de IA?",
         "Na arquitetura RAG enterprise, quais componentes sao obrigatorios?",
@@ -99,9 +118,15 @@ def test_questions():
     print("TESTE - Perguntas do Desafio Atlantyx")
     print("=" * 60)
 
-    for i, q in enumerate(questions, 1):
+    # Um unico event loop para todas; saida impressa em ordem ao final
+    answers = asyncio.run(ask_questions(questions))
+
+    for i, (q, answer) in enumerate(zip(questions, answers), 1):
         print(f"\n--- Pergunta {i} ---")
-        asyncio.run(streaming_question(q))
+        print(f"\nPergunta: {q}")
+        print("-" * 40)
+        print(f"Resposta: {answer}")
+        print("-" * 40)
 
 
 if __name__ == "__main__":
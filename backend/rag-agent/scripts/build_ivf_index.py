@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# =============================================================================
+# BUILD IVF INDEX - Cria Índice IVF (clusters) para Busca Aproximada
+# =============================================================================
+# Agrupa os embeddings em ~sqrt(N) clusters e grava as tabelas
+# vec_centroides / vec_documentos_ivf. Ativar na busca com IVF_PROBES > 0.
+# A ingestão mantém o índice em dia; rodar de novo após reindexar tudo (para
+# reequilibrar os clusters) ou se a busca avisar que o índice está defasado.
+# =============================================================================
+
+import sys
+import time
+import argparse
+from pathlib import Path
+import apsw
+import sqlite_vec
+
+# Adicionar parent ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.config import get_config, QUANTIZATION_INT8, RESCORE_TABLE
+from core.ivf_index import build_ivf_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Criar índice IVF sobre vec_documentos")
+    parser.add_argument(
+        "--db-path",
+        type=str,
+        default=None,
+        help="Caminho do banco de dados (padrão: config)",
+    )
+    parser.add_argument(
+        "--clusters",
+        type=int,
+        default=None,
+        help="Número de clusters (padrão: sqrt(N))",
+    )
+
+    args = parser.parse_args()
+    config = get_config()
+    db_path = args.db_path or str(config.db_path)
+
+    # O IVF guarda vetores float32: com int8, a fonte é a cópia de re-score
+    if config.embedding_quantization == QUANTIZATION_INT8:
+        if not config.rescore_enabled:
+            print(f"❌ Vetores int8 sem cópia float32 ({RESCORE_TABLE}); habilite EMBEDDING_RESCORE_FACTOR")
+            sys.exit(1)
+        source_sql = f"SELECT doc_id, embedding FROM {RESCORE_TABLE}"
+    else:
+        source_sql = "SELECT doc_id, embedding FROM vec_documentos"
+
+    print("=" * 60)
+    print("🧭 ÍNDICE IVF")
+    print("=" * 60)
+    print(f"Banco de dados: {db_path}")
+
+    conn = apsw.Connection(db_path)
+    conn.enableloadextension(True)
+    conn.loadextension(sqlite_vec.loadable_path())
+    conn.enableloadextension(False)
+
+    start = time.perf_counter()
+    try:
+        with conn:
+            n_clusters = build_ivf_index(conn.cursor(), source_sql, n_clusters=args.clusters)
+    except Exception as e:
+        print(f"❌ Erro ao criar índice: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    if not n_clusters:
+        print("⚠️  Nenhum embedding encontrado")
+        return
+
+    print(f"✅ {n_clusters} clusters criados em {time.perf_counter() - start:.2f}s")
+    print(f"💡 Ative na busca com IVF_PROBES (ex: IVF_PROBES={max(1, n_clusters // 10)})")
+
+
+if __name__ == "__main__":
+    main()
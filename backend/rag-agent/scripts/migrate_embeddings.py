@@ -11,6 +11,7 @@ import time
 import argparse
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 import apsw
 import sqlite_vec
 from fastembed import TextEmbedding
@@ -18,10 +19,20 @@ from fastembed import TextEmbedding
 # Adicionar parent ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.config import get_config, EmbeddingModel
+from core.config import (
+    get_config, EmbeddingModel, QUANTIZATIONS, QUANTIZATION_INT8,
+    RESCORE_TABLE, RESCORE_TABLE_DDL, vector_column, vector_param, bump_data_version,
+)
+from core.ivf_index import drop_ivf_index
 from core.logger import logger
 
 
+# Cópias float32 do modelo novo ficam em staging até o swap: a tabela de
+# re-score em uso continua coerente com vec_documentos durante a migração
+RESCORE_STAGING_TABLE = f"{RESCORE_TABLE}_v2"
+RESCORE_OLD_TABLE = f"{RESCORE_TABLE}_old"
+
+
 class EmbeddingMigrator:
     """Migra embeddings entre modelos diferentes."""
 
@@ -31,12 +42,25 @@ class EmbeddingMigrator:
         source_model: EmbeddingModel,
         target_model: EmbeddingModel,
         batch_size: int = 10,
+        source_quantization: Optional[str] = None,
+        target_quantization: Optional[str] = None,
     ):
         self.db_path = db_path
         self.source_model = source_model
         self.target_model = target_model
         self.batch_size = batch_size
 
+        # Formato dos vetores (float32 | int8); padrão: o da config atual
+        current = get_config().embedding_quantization
+        self.source_quantization = source_quantization or current
+        self.target_quantization = target_quantization or current
+
+        # int8 com re-score: também grava a cópia float32 de cada vetor
+        self.rescore = (
+            self.target_quantization == QUANTIZATION_INT8
+            and get_config().embedding_rescore_factor > 0
+        )
+
         # Inicializar modelo target
         print(f"📦 Carregando modelo {target_model.value}...")
         self.model = TextEmbedding(target_model.value)
@@ -59,8 +83,15 @@ class EmbeddingMigrator:
         conn.enableloadextension(False)
         return conn
 
+    def _table_exists(self, cursor, name: str) -> bool:
+        """Tabela (ou tabela virtual) existe no banco?"""
+        row = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone()
+        return row is not None
+
     def backup_table(self):
-        """Faz backup da tabela vec_documentos."""
+        """Faz backup da tabela vec_documentos (e da cópia float32 de re-score)."""
         print("\n🗄️  Fazendo backup da tabela vec_documentos...")
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -73,7 +104,7 @@ class EmbeddingMigrator:
             cursor.execute(f"""
                 CREATE VIRTUAL TABLE {backup_table} USING vec0(
                     doc_id INTEGER PRIMARY KEY,
-                    embedding float[{self.source_model.dimensions}]
+                    embedding {vector_column(self.source_model.dimensions, self.source_quantization)}
                 )
             """)
 
@@ -90,6 +121,12 @@ class EmbeddingMigrator:
 
             print(f"✅ Backup criado: {backup_table} ({backup_count:,} registros)")
 
+            # Cópia float32 de re-score (tabela comum)
+            if self._table_exists(cursor, RESCORE_TABLE):
+                rescore_backup = f"{RESCORE_TABLE}_backup_{timestamp}"
+                cursor.execute(f"CREATE TABLE {rescore_backup} AS SELECT * FROM {RESCORE_TABLE}")
+                print(f"✅ Backup criado: {rescore_backup}")
+
         except Exception as e:
             print(f"❌ Erro ao fazer backup: {e}")
             raise
@@ -100,7 +137,10 @@ class EmbeddingMigrator:
 
     def create_new_table(self):
         """Cria nova tabela vec_documentos_v2 com dimensões corretas."""
-        print(f"\n🔧 Criando nova tabela (dimensões: {self.target_model.dimensions})...")
+        print(
+            f"\n🔧 Criando nova tabela (dimensões: {self.target_model.dimensions}, "
+            f"{self.target_quantization})..."
+        )
         conn = self.get_connection()
         cursor = conn.cursor()
 
@@ -112,10 +152,14 @@ class EmbeddingMigrator:
             cursor.execute(f"""
                 CREATE VIRTUAL TABLE vec_documentos_v2 USING vec0(
                     doc_id INTEGER PRIMARY KEY,
-                    embedding float[{self.target_model.dimensions}]
+                    embedding {vector_column(self.target_model.dimensions, self.target_quantization)}
                 )
             """)
 
+            cursor.execute(f"DROP TABLE IF EXISTS {RESCORE_STAGING_TABLE}")
+            if self.rescore:
+                cursor.execute(RESCORE_TABLE_DDL.replace(RESCORE_TABLE, RESCORE_STAGING_TABLE))
+
             print("✅ Tabela vec_documentos_v2 criada")
 
         except Exception as e:
@@ -177,13 +221,19 @@ class EmbeddingMigrator:
             # Gerar embeddings
             embeddings = list(self.model.embed(texts))
 
-            # Inserir no banco
+            # Inserir no banco (quantizado pelo sqlite-vec se int8)
+            insert_sql = f"""
+                INSERT OR REPLACE INTO vec_documentos_v2 (doc_id, embedding)
+                VALUES (?, {vector_param(self.target_quantization)})
+            """
             for doc_id, embedding in zip(doc_ids, embeddings):
-                embedding_bytes = sqlite_vec.serialize_float32(embedding.tolist())
-                cursor.execute("""
-                    INSERT OR REPLACE INTO vec_documentos_v2 (doc_id, embedding)
-                    VALUES (?, ?)
-                """, (doc_id, embedding_bytes))
+                embedding_bytes = embedding.astype("float32", copy=False).tobytes()
+                cursor.execute(insert_sql, (doc_id, embedding_bytes))
+                if self.rescore:
+                    cursor.execute(
+                        f"INSERT OR REPLACE INTO {RESCORE_STAGING_TABLE} (doc_id, embedding) VALUES (?, ?)",
+                        (doc_id, embedding_bytes),
+                    )
 
         except Exception as e:
             print(f"\n⚠️  Erro ao processar batch: {e}")
@@ -233,16 +283,35 @@ class EmbeddingMigrator:
         cursor = conn.cursor()
 
         try:
-            # Renomear original para _old
-            cursor.execute("DROP TABLE IF EXISTS vec_documentos_old")
-            cursor.execute("ALTER TABLE vec_documentos RENAME TO vec_documentos_old")
+            # Vetores e cópias float32 trocados juntos, em uma transação
+            with conn:
+                # Renomear original para _old
+                cursor.execute("DROP TABLE IF EXISTS vec_documentos_old")
+                cursor.execute("ALTER TABLE vec_documentos RENAME TO vec_documentos_old")
+
+                # Renomear v2 para vec_documentos
+                cursor.execute("ALTER TABLE vec_documentos_v2 RENAME TO vec_documentos")
 
-            # Renomear v2 para vec_documentos
-            cursor.execute("ALTER TABLE vec_documentos_v2 RENAME TO vec_documentos")
+                # Cópias float32 do modelo antigo saem mesmo sem re-score no destino
+                cursor.execute(f"DROP TABLE IF EXISTS {RESCORE_OLD_TABLE}")
+                if self._table_exists(cursor, RESCORE_TABLE):
+                    cursor.execute(f"ALTER TABLE {RESCORE_TABLE} RENAME TO {RESCORE_OLD_TABLE}")
+                if self.rescore:
+                    cursor.execute(f"ALTER TABLE {RESCORE_STAGING_TABLE} RENAME TO {RESCORE_TABLE}")
+
+                # Índice IVF descreve os vetores antigos (outra dimensão/modelo)
+                drop_ivf_index(cursor)
+
+                # Invalida caches de leitura do MCP server (documentos, BM25)
+                bump_data_version(cursor)
 
             print("✅ Swap realizado com sucesso!")
             print("   vec_documentos → vec_documentos_old")
             print("   vec_documentos_v2 → vec_documentos")
+            print(f"   {RESCORE_TABLE} → {RESCORE_OLD_TABLE}")
+            if self.rescore:
+                print(f"   {RESCORE_STAGING_TABLE} → {RESCORE_TABLE}")
+            print("   Índice IVF removido (recriar com scripts/build_ivf_index.py)")
 
         except Exception as e:
             print(f"❌ Erro ao fazer swap: {e}")
@@ -300,6 +369,13 @@ def main():
         choices=["bge-small", "bge-base", "bge-large"],
         help="Modelo de destino (padrão: bge-large)",
     )
+    parser.add_argument(
+        "--quantization",
+        type=str,
+        default=None,
+        choices=list(QUANTIZATIONS),
+        help="Formato dos vetores no destino (padrão: EMBEDDING_QUANTIZATION da config)",
+    )
     parser.add_argument(
         "--db-path",
         type=str,
@@ -335,8 +411,11 @@ def main():
     source_model = model_map[args.source]
     target_model = model_map[args.target]
 
-    if source_model == target_model:
-        print("❌ Modelo de origem e destino são iguais!")
+    source_quantization = get_config().embedding_quantization
+    target_quantization = args.quantization or source_quantization
+
+    if source_model == target_model and source_quantization == target_quantization:
+        print("❌ Modelo e formato de origem e destino são iguais!")
         return
 
     # DB path
@@ -352,6 +431,7 @@ def main():
     print(f"Banco de dados: {db_path}")
     print(f"Modelo origem: {source_model.value} ({source_model.dimensions}D)")
     print(f"Modelo destino: {target_model.value} ({target_model.dimensions}D)")
+    print(f"Formato: {source_quantization} → {target_quantization}")
     print(f"Batch size: {args.batch_size}")
 
     if args.dry_run:
@@ -375,6 +455,8 @@ def main():
         source_model=source_model,
         target_model=target_model,
         batch_size=args.batch_size,
+        source_quantization=source_quantization,
+        target_quantization=target_quantization,
     )
 
     try:
@@ -401,6 +483,8 @@ def main():
             print("\n💡 Para reverter, use:")
             print(f"   ALTER TABLE vec_documentos RENAME TO vec_documentos_failed;")
             print(f"   ALTER TABLE vec_documentos_old RENAME TO vec_documentos;")
+            print(f"   DROP TABLE IF EXISTS {RESCORE_TABLE};")
+            print(f"   ALTER TABLE {RESCORE_OLD_TABLE} RENAME TO {RESCORE_TABLE};  -- se existir")
         else:
             print("\n⚠️  Migração completa mas verificação falhou. Verifique manualmente.")
 
@@ -1,106 +1,209 @@
 from fastapi import FastAPI, Request, Depends, HTTPException
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.responses import StreamingResponse, FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional
 import json
+import mmap
 import os
 import sys
 import importlib.util
 import asyncio
 import shutil
+import time
+import orjson
 
 from claude_agent_sdk import ClaudeSDKClient, AssistantMessage, TextBlock, ProcessError
 
+
+def _load_rag_module(name: str, path: Path):
+    """
+    Importa módulo do rag-agent pelo caminho, uma vez por processo.
+
+    rag-agent/config.py colide com backend/config.py, então não dá para usar
+    import normal; o módulo fica em sys.modules e recargas reaproveitam.
+    """
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
 # Importa config do RAG Agent
-rag_config_path = Path(__file__).parent / "rag-agent" / "config.py"
-spec = importlib.util.spec_from_file_location("rag_config", rag_config_path)
-rag_config = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(rag_config)
+rag_config = _load_rag_module("rag_config", Path(__file__).parent / "rag-agent" / "config.py")
 RAG_AGENT_OPTIONS = rag_config.RAG_AGENT_OPTIONS
 
 # Importa modulos de seguranca
 sys.path.insert(0, str(Path(__file__).parent))
 from core.security import get_allowed_origins, get_allowed_methods, get_allowed_headers, SECURITY_CONFIG
-from core.rate_limiter import get_limiter, RATE_LIMITS, get_client_ip, SLOWAPI_AVAILABLE
+from core.rate_limiter import get_limiter, get_concurrency_limiter, ConcurrencySlot, RATE_LIMITS, get_client_ip, SLOWAPI_AVAILABLE
 from core.prompt_guard import validate_prompt
-from core.auth import verify_api_key, is_auth_enabled
+from core.auth import verify_api_key, is_auth_enabled, VALID_API_KEYS
+
+# Funções de logger para session tracking (core/logger.py é espelho do rag-agent)
+from core.logger import RAGLogger, set_session_id, get_session_id
 
-# Importa funções de logger do RAG agent para session tracking
-rag_logger_path = Path(__file__).parent / "rag-agent" / "core" / "logger.py"
-spec_logger = importlib.util.spec_from_file_location("rag_logger", rag_logger_path)
-rag_logger = importlib.util.module_from_spec(spec_logger)
-spec_logger.loader.exec_module(rag_logger)
-set_session_id = rag_logger.set_session_id
-get_session_id = rag_logger.get_session_id
+# Logs do servidor: enfileirados e escritos por thread dedicada (sem print
+# síncrono no stdout dentro do event loop)
+log = RAGLogger("chat")
 
 SESSIONS_DIR = Path.home() / ".claude" / "projects" / "-Users-2a--claude-hello-agent-chat-simples-backend-rag-agent"
 RAG_OUTPUTS_DIR = Path(__file__).parent / "rag-agent" / "outputs"
 
 client: ClaudeSDKClient | None = None
 
+# Um turno por vez no cliente compartilhado: a sessão do SDK é única e
+# respostas de requests concorrentes se misturariam em receive_response()
+_chat_lock = asyncio.Lock()
+
+# Metadados das sessões (contagem de mensagens, modelo) por arquivo JSONL:
+# nome -> (mtime_ns, tamanho, metadados). Arquivo inalterado não é relido
+_SESSION_META_CACHE: dict[str, tuple[int, int, dict]] = {}
+
+# Contagem de outputs por pasta de sessão: caminho -> (mtime_ns do diretório, contagem)
+_OUTPUT_COUNT_CACHE: dict[str, tuple[int, int]] = {}
+
+
+def _scan_files(directory: Path, suffix: str = "") -> list[tuple[os.stat_result, os.DirEntry]]:
+    """
+    Arquivos do diretório com stat, do mais recente para o mais antigo.
+
+    Um stat por arquivo (reaproveitado no payload) e ordenação pela chave
+    inteira st_mtime_ns.
+    """
+    with os.scandir(directory) as it:
+        rows = [
+            (entry.stat(), entry)
+            for entry in it
+            if entry.name.endswith(suffix) and entry.is_file(follow_symlinks=False)
+        ]
+    rows.sort(key=lambda row: row[0].st_mtime_ns, reverse=True)
+    return rows
+
+
+SESSION_HEAD_BYTES = 512
+_SESSION_ID_KEY = b'"sessionId":"'
+
+
+def _extract_session_id(head: bytes) -> Optional[str]:
+    """
+    sessionId do início de uma linha JSONL via busca de bytes (sem parse).
+
+    Returns:
+        session_id ou None se a chave não estiver completa no trecho
+    """
+    start = head.find(_SESSION_ID_KEY)
+    if start < 0:
+        return None
+    start += len(_SESSION_ID_KEY)
+    end = head.find(b'"', start)
+    if end < 0:
+        return None
+    return head[start:end].decode()
+
 
 def extract_session_id_from_jsonl() -> str:
     """Extrai session_id do arquivo JSONL mais recente."""
     if not SESSIONS_DIR.exists():
         return "default"
 
-    # Pegar JSONL mais recente (por mtime)
-    jsonl_files = sorted(
-        SESSIONS_DIR.glob("*.jsonl"),
-        key=lambda f: f.stat().st_mtime,
-        reverse=True
-    )
-
-    if not jsonl_files:
+    # JSONL mais recente (por mtime) em uma passada, sem ordenar a lista
+    latest_jsonl = None
+    latest_mtime = -1
+    with os.scandir(SESSIONS_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".jsonl"):
+                mtime = entry.stat().st_mtime_ns
+                if mtime > latest_mtime:
+                    latest_jsonl, latest_mtime = entry, mtime
+
+    if latest_jsonl is None:
         return "default"
 
-    latest_jsonl = jsonl_files[0]
+    stem = latest_jsonl.name[:-len(".jsonl")]
 
-    # Ler primeira linha para extrair sessionId
+    # Ler início da primeira linha para extrair sessionId
     try:
-        with open(latest_jsonl, 'r') as f:
-            first_line = f.readline().strip()
+        with open(latest_jsonl.path, 'rb') as f:
+            head = f.read(SESSION_HEAD_BYTES)
+            first_line = head.split(b"\n", 1)[0].strip()
             if first_line:
-                data = json.loads(first_line)
-                session_id = data.get("sessionId", latest_jsonl.stem)
+                session_id = _extract_session_id(first_line)
+                if session_id is None:
+                    # Chave fora do bloco lido ou com outra formatação: parse completo
+                    f.seek(0)
+                    data = orjson.loads(f.readline())
+                    session_id = data.get("sessionId", stem)
                 return session_id
     except Exception as e:
-        print(f"[WARN] Não foi possível extrair sessionId: {e}")
-        return latest_jsonl.stem  # Fallback: usar nome do arquivo
+        log.warning("session_id_extract_failed", file=latest_jsonl.name, error=str(e))
+        return stem  # Fallback: usar nome do arquivo
 
     return "default"
 
 
+# Espera pelo primeiro JSONL da sessão: polling curto com teto (o antigo
+# sleep fixo de 200 ms vira o pior caso)
+SESSION_FILE_POLL = 0.005
+SESSION_FILE_TIMEOUT = 0.2
+# Folga para a granularidade do mtime do sistema de arquivos
+MTIME_SLACK = 0.01
+
+
+def _has_session_file_since(since: float) -> bool:
+    """Há JSONL não vazio modificado desde `since` (epoch)?"""
+    with os.scandir(SESSIONS_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".jsonl"):
+                st = entry.stat()
+                if st.st_size > 0 and st.st_mtime >= since - MTIME_SLACK:
+                    return True
+    return False
+
+
+async def _wait_for_session_file(since: float, timeout: float = SESSION_FILE_TIMEOUT) -> None:
+    """Aguarda o SDK gravar o JSONL da sessão (retorna assim que aparecer)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if SESSIONS_DIR.exists() and _has_session_file_since(since):
+            return
+        await asyncio.sleep(SESSION_FILE_POLL)
+
+
 async def get_client() -> ClaudeSDKClient:
     """Retorna o cliente, criando se necessário."""
     global client
     if client is None:
         # Criar cliente único (evita mismatch de session_id)
         client = ClaudeSDKClient(options=RAG_AGENT_OPTIONS)
+        started_at = time.time()
         try:
             await client.__aenter__()
-            print("🔗 Nova sessão criada!")
+            log.info("session_created")
 
             # Aguardar SDK escrever primeira linha do JSONL
-            await asyncio.sleep(0.2)
+            await _wait_for_session_file(started_at)
 
             # Extrair session_id do cliente ativo
             session_id = extract_session_id_from_jsonl()
             set_session_id(session_id)
-            print(f"📁 Session ID: {session_id}")
+            log.info("session_id_resolved", session_id=session_id)
 
             # Criar pasta da sessão para outputs
             session_output_dir = RAG_OUTPUTS_DIR / session_id
             session_output_dir.mkdir(parents=True, exist_ok=True)
-            print(f"📂 Pasta da sessão criada: {session_output_dir}")
+            log.info("session_output_dir_created", path=str(session_output_dir))
 
             # Inicializar AgentFS para a sessão
             from core.agentfs_manager import init_agentfs
             await init_agentfs(session_id)
-            print(f"🗄️  AgentFS inicializado: ~/.claude/.agentfs/{session_id}.db")
+            log.info("agentfs_initialized", db=f"~/.claude/.agentfs/{session_id}.db")
 
             # Definir variável de ambiente para MCP server usar auditoria
             os.environ["AGENTFS_SESSION_ID"] = session_id
@@ -132,24 +235,25 @@ async def reset_client():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gerencia ciclo de vida do app."""
-    print("🚀 Iniciando Chat Simples...")
+    log.info("server_starting")
     yield
     # Cleanup ao desligar
     global client
     if client is not None:
         await client.__aexit__(None, None, None)
-        print("👋 Sessão encerrada!")
+        log.info("session_closed")
 
     # Fechar AgentFS
     from core.agentfs_manager import close_agentfs
     await close_agentfs()
-    print("🗄️  AgentFS fechado")
+    log.info("agentfs_closed")
 
 app = FastAPI(
     title="Chat Simples",
     description="Backend com sessão persistente - Claude Agent SDK",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # Respostas JSON serializadas pelo orjson
 )
 
 # CORS - permitir localhost em dev
@@ -161,6 +265,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+# Rotas SSE: gzip bufferiza os frames e atrasaria o streaming
+STREAMING_PATHS = frozenset({"/chat/stream"})
+
+
+class GZipExceptStreamsMiddleware:
+    """GZip para respostas JSON grandes (listagens), sem tocar nos streams SSE."""
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in STREAMING_PATHS:
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+
+app.add_middleware(GZipExceptStreamsMiddleware, minimum_size=1024)
+
 # Rate limiter (Debito #2)
 limiter = get_limiter()
 if SLOWAPI_AVAILABLE:
@@ -169,6 +294,53 @@ if SLOWAPI_AVAILABLE:
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Limite de requisições simultâneas por IP (chat e stream)
+concurrency_limiter = get_concurrency_limiter()
+
+
+def _acquire_chat_slot(request: Request) -> ConcurrencySlot:
+    """Ocupa vaga de concorrência do IP ou responde 429."""
+    slot = concurrency_limiter.slot(get_client_ip(request))
+    if slot is None:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Limite de {concurrency_limiter.max_concurrent} requisições simultâneas por cliente",
+        )
+    return slot
+
+
+class SlotStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse que libera a vaga de concorrência ao terminar.
+
+    Garante a liberação mesmo quando o corpo nunca chega a ser iterado
+    (cliente desconectado ou falha no envio dos headers), caso em que o
+    finally do gerador não roda.
+    """
+
+    def __init__(self, content, slot: ConcurrencySlot, **kwargs):
+        super().__init__(content, **kwargs)
+        self.slot = slot
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.slot.release()
+
+
+# Configuração fixa após o start: lida uma vez, não a cada health check
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+AUTH_ENABLED = is_auth_enabled()
+SECURITY_STATUS = {
+    "auth_enabled": AUTH_ENABLED,
+    "cors_origins": len(get_allowed_origins()),
+    "rate_limiter": "slowapi" if SLOWAPI_AVAILABLE else "simple",
+    "prompt_guard": "active"
+}
+# Expor a API key no "/" só em dev com auth habilitada
+EXPOSE_DEV_KEY = ENVIRONMENT != "production" and AUTH_ENABLED
+
 
 class ChatRequest(BaseModel):
     message: str
@@ -180,35 +352,26 @@ class ChatResponse(BaseModel):
 async def root():
     """Health check."""
     global client
-    env = os.getenv("ENVIRONMENT", "development")
     response = {
         "status": "ok",
         "session_active": client is not None,
         "message": "Chat Simples v2 - Sessão Persistente",
-        "auth_enabled": is_auth_enabled()
+        "auth_enabled": AUTH_ENABLED
     }
-    # Em dev, expor a API key
-    if env != "production" and is_auth_enabled():
-        from core.auth import VALID_API_KEYS
-        if VALID_API_KEYS:
-            response["dev_key"] = list(VALID_API_KEYS)[0]
+    # Em dev, expor a API key (o conjunto de chaves pode mudar em runtime)
+    if EXPOSE_DEV_KEY and VALID_API_KEYS:
+        response["dev_key"] = next(iter(VALID_API_KEYS))
     return response
 
 @app.get("/health")
 async def health_check():
     """Health check detalhado com status de segurança."""
     global client
-    env = os.getenv("ENVIRONMENT", "development")
     return {
         "status": "healthy",
-        "environment": env,
+        "environment": ENVIRONMENT,
         "session_active": client is not None,
-        "security": {
-            "auth_enabled": is_auth_enabled(),
-            "cors_origins": len(get_allowed_origins()),
-            "rate_limiter": "slowapi" if SLOWAPI_AVAILABLE else "simple",
-            "prompt_guard": "active"
-        }
+        "security": SECURITY_STATUS
     }
 
 
@@ -242,15 +405,18 @@ async def get_current_session():
         }
     session_file = SESSIONS_DIR / f"{session_id}.jsonl"
 
-    # Contar mensagens
+    # Contar mensagens: um stat; o JSONL só é relido se mudou desde a última chamada
     message_count = 0
-    if session_file.exists():
-        message_count = len(session_file.read_text().strip().split('\n'))
+    try:
+        message_count = _get_session_meta(session_file, session_file.stat())["message_count"]
+    except FileNotFoundError:
+        pass
 
     # Verificar outputs no rag-agent
     session_output_dir = RAG_OUTPUTS_DIR / session_id
-    has_outputs = session_output_dir.exists()
-    output_count = len(list(session_output_dir.iterdir())) if has_outputs else 0
+    output_count = _count_outputs(session_output_dir)
+    has_outputs = output_count is not None
+    output_count = output_count or 0
 
     return {
         "active": True,
@@ -278,27 +444,31 @@ async def chat(
             detail=f"Mensagem bloqueada: {validation.message}"
         )
 
+    slot = _acquire_chat_slot(request)
     try:
-        c = await get_client()
+        parts: list[str] = []
+        async with _chat_lock:
+            c = await get_client()
 
-        # Envia mensagem
-        await c.query(chat_request.message)
+            # Envia mensagem
+            await c.query(chat_request.message)
 
-        # Coleta resposta
-        response_text = ""
-        async for message in c.receive_response():
-            if isinstance(message, AssistantMessage):
-                for block in message.content:
-                    if isinstance(block, TextBlock):
-                        response_text += block.text
+            # Coleta resposta (blocos juntados uma vez no final)
+            async for message in c.receive_response():
+                if isinstance(message, AssistantMessage):
+                    for block in message.content:
+                        if isinstance(block, TextBlock):
+                            parts.append(block.text)
 
-        return ChatResponse(response=response_text)
+        return ChatResponse(response="".join(parts))
 
     except ProcessError as e:
         raise HTTPException(status_code=503, detail=f"Erro ao processar com Claude: {str(e)}")
     except Exception as e:
-        print(f"[ERROR] Chat error: {e}")
+        log.error("chat_error", error=str(e))
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
+    finally:
+        slot.release()
 
 @app.post("/chat/stream")
 @limiter.limit(RATE_LIMITS["chat_stream"])
@@ -316,24 +486,35 @@ async def chat_stream(
             detail=f"Mensagem bloqueada: {validation.message}"
         )
 
+    # A vaga fica ocupada até o stream terminar (ou o cliente desconectar)
+    slot = _acquire_chat_slot(request)
     try:
-        c = await get_client()
+        # Cria a sessão antes do stream: falhas viram 503/500 aqui
+        await get_client()
 
+        # Frames SSE já em bytes: o Starlette escreve direto, sem encode por chunk
         async def generate():
-            await c.query(chat_request.message)
-            async for message in c.receive_response():
-                if isinstance(message, AssistantMessage):
-                    for block in message.content:
-                        if isinstance(block, TextBlock):
-                            yield f"data: {block.text}\n\n"
-            yield "data: [DONE]\n\n"
-
-        return StreamingResponse(generate(), media_type="text/event-stream")
+            try:
+                async with _chat_lock:
+                    c = await get_client()  # Pode ter sido resetado enquanto aguardava
+                    await c.query(chat_request.message)
+                    async for message in c.receive_response():
+                        if isinstance(message, AssistantMessage):
+                            for block in message.content:
+                                if isinstance(block, TextBlock):
+                                    yield b"data: " + block.text.encode() + b"\n\n"
+                yield b"data: [DONE]\n\n"
+            finally:
+                slot.release()
+
+        return SlotStreamingResponse(generate(), slot, media_type="text/event-stream")
 
     except ProcessError as e:
+        slot.release()
         raise HTTPException(status_code=503, detail=f"Erro ao processar com Claude: {str(e)}")
     except Exception as e:
-        print(f"[ERROR] Stream error: {e}")
+        slot.release()
+        log.error("stream_error", error=str(e))
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
 
 @app.post("/reset")
@@ -341,7 +522,9 @@ async def chat_stream(
 async def reset_session(request: Request, api_key: str = Depends(verify_api_key)):
     """Inicia nova sessão (novo JSONL)."""
     old_session_id = get_session_id()
-    await reset_client()
+    reset_at = time.time()
+    async with _chat_lock:  # Não derrubar a sessão no meio de um turno
+        await reset_client()
 
     # Limpar arquivo de sessão atual (AgentFS)
     session_file_path = Path.home() / ".claude" / ".agentfs" / "current_session"
@@ -352,7 +535,7 @@ async def reset_session(request: Request, api_key: str = Depends(verify_api_key)
             pass
 
     # Aguardar nova sessão ser criada
-    await asyncio.sleep(0.1)
+    await _wait_for_session_file(reset_at, timeout=0.1)
     new_session_id = extract_session_id_from_jsonl()
     set_session_id(new_session_id)
 
@@ -364,25 +547,44 @@ async def reset_session(request: Request, api_key: str = Depends(verify_api_key)
     }
 
 
-@app.get("/sessions")
-async def list_sessions():
-    """Lista todas as sessões disponíveis."""
-    sessions = []
+# Bloco da contagem de linhas sobre o arquivo mapeado
+_COUNT_BLOCK = 1 << 20  # 1 MB
 
-    if not SESSIONS_DIR.exists():
-        return {"count": 0, "sessions": []}
+# Chave JSON procurada no início do JSONL
+_MODEL_KEY = b'"model"'
 
-    for file in sorted(SESSIONS_DIR.glob("*.jsonl"), key=lambda f: f.stat().st_mtime, reverse=True):
-        try:
-            lines = file.read_text().strip().split('\n')
-            message_count = len(lines)
 
-            # Usar nome do arquivo como session_id único
-            session_id = file.stem
+def _count_lines(mm: mmap.mmap) -> int:
+    """
+    Conta linhas completas do arquivo mapeado (memchr em C, sem decodificar).
 
-            # Tentar extrair modelo da primeira mensagem
-            model = "unknown"
-            for line in lines[:5]:
+    Última linha sem quebra final ainda está sendo gravada e não conta, como
+    em _stream_session_messages: /sessions e /sessions/{id} batem.
+    """
+    size = len(mm)
+    return sum(mm[i:i + _COUNT_BLOCK].count(b"\n") for i in range(0, size, _COUNT_BLOCK))
+
+
+def _read_session_meta(file: Path) -> dict:
+    """Conta mensagens e extrai o modelo de um JSONL sem decodificar o arquivo todo."""
+    model = "unknown"
+
+    with file.open("rb") as f:
+        # mmap não aceita arquivo vazio
+        if os.fstat(f.fileno()).st_size == 0:
+            return {"message_count": 0, "model": model}
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            message_count = _count_lines(mm)
+
+            # Modelo: procurado nas primeiras 5 linhas. Busca de bytes (memchr
+            # em C) antes do json.loads: linhas sem "model" nem são parseadas
+            for _ in range(5):
+                line = mm.readline()
+                if not line:
+                    break
+                if _MODEL_KEY not in line:
+                    continue
                 try:
                     data = json.loads(line)
                     if "message" in data and "model" in data.get("message", {}):
@@ -391,26 +593,136 @@ async def list_sessions():
                 except:
                     pass
 
-            # Verificar se há outputs para esta sessão
-            session_output_dir = RAG_OUTPUTS_DIR / session_id
-            has_outputs = session_output_dir.exists()
-            output_count = len(list(session_output_dir.iterdir())) if has_outputs else 0
+    return {"message_count": message_count, "model": model}
 
-            sessions.append({
-                "session_id": session_id,
-                "file_name": file.name,
-                "file": str(file),
-                "message_count": message_count,
-                "model": model,
-                "updated_at": file.stat().st_mtime * 1000,
-                "has_outputs": has_outputs,
-                "output_count": output_count
-            })
-        except Exception as e:
-            print(f"Erro ao ler {file}: {e}")
+
+def _count_outputs(output_dir: Path) -> Optional[int]:
+    """
+    Número de entradas na pasta de outputs (None se não existe).
+
+    O mtime do diretório muda quando entradas são criadas/removidas: com ele
+    igual, a contagem anterior vale e a pasta não é listada de novo.
+    """
+    try:
+        mtime_ns = output_dir.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    key = str(output_dir)
+    cached = _OUTPUT_COUNT_CACHE.get(key)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    with os.scandir(output_dir) as it:
+        count = sum(1 for _ in it)
+    _OUTPUT_COUNT_CACHE[key] = (mtime_ns, count)
+    return count
+
+
+def _get_session_meta(file: Path, st: os.stat_result) -> dict:
+    """Metadados do JSONL (do cache se mtime e tamanho não mudaram)."""
+    cached = _SESSION_META_CACHE.get(file.name)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    meta = _read_session_meta(file)
+    _SESSION_META_CACHE[file.name] = (st.st_mtime_ns, st.st_size, meta)
+    return meta
+
+
+# Máximo de arquivos processados em paralelo nas listagens (threads)
+FILE_WORKERS = 32
+
+
+async def _gather_in_threads(func, items, *args) -> list:
+    """Executa func(item, *args) em threads, no máximo FILE_WORKERS por vez."""
+    semaphore = asyncio.Semaphore(FILE_WORKERS)
+
+    async def run(item):
+        async with semaphore:
+            return await asyncio.to_thread(func, item, *args)
+
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+def _session_info(item: tuple[os.stat_result, os.DirEntry]) -> Optional[dict]:
+    """Resumo de uma sessão para a listagem (roda em thread)."""
+    st, entry = item
+    file = Path(entry.path)
+    try:
+        meta = _get_session_meta(file, st)
+
+        # Usar nome do arquivo como session_id único
+        session_id = file.stem
+
+        # Verificar se há outputs para esta sessão
+        output_count = _count_outputs(RAG_OUTPUTS_DIR / session_id)
+        has_outputs = output_count is not None
+        output_count = output_count or 0
+
+        return {
+            "session_id": session_id,
+            "file_name": file.name,
+            "file": str(file),
+            "message_count": meta["message_count"],
+            "model": meta["model"],
+            "updated_at": st.st_mtime * 1000,
+            "has_outputs": has_outputs,
+            "output_count": output_count
+        }
+    except Exception as e:
+        log.warning("session_read_failed", file=str(file), error=str(e))
+        return None
+
+
+@app.get("/sessions")
+async def list_sessions():
+    """Lista todas as sessões disponíveis."""
+    if not SESSIONS_DIR.exists():
+        return {"count": 0, "sessions": []}
+
+    # scandir: nome e tipo vêm da leitura do diretório; stat uma vez por arquivo
+    entries = _scan_files(SESSIONS_DIR, ".jsonl")
+
+    # Leitura dos JSONL em paralelo; gather preserva a ordem por mtime
+    sessions = [info for info in await _gather_in_threads(_session_info, entries) if info]
 
     return {"count": len(sessions), "sessions": sessions}
 
+SESSION_STREAM_CHUNK = 64 * 1024
+
+
+def _stream_session_messages(file_path: Path):
+    """
+    Gera {"messages": [...], "count": N} repassando as linhas do JSONL.
+
+    Cada linha completa já é um objeto JSON (o SDK grava uma linha inteira
+    por vez): basta concatená-las com vírgulas, sem parse nem
+    re-serialização. Memória limitada a um bloco de saída.
+    Linha sem terminador (sessão sendo gravada) é descartada, a mesma regra
+    de _count_lines.
+    Gerador síncrono: o Starlette o consome em threadpool.
+    """
+    count = 0
+    buffer = bytearray(b'{"messages":[')
+    with file_path.open("rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # Última linha ainda incompleta
+            line = line.strip()
+            if not line:
+                continue
+            if count:
+                buffer += b","
+            buffer += line
+            count += 1
+            if len(buffer) >= SESSION_STREAM_CHUNK:
+                yield bytes(buffer)
+                buffer.clear()
+    buffer += b'],"count":%d}' % count
+    yield bytes(buffer)
+
+
 @app.get("/sessions/{session_id}")
 async def get_session(session_id: str):
     """Retorna mensagens de uma sessão."""
@@ -419,20 +731,11 @@ async def get_session(session_id: str):
     if not file_path.exists():
         return {"error": "Sessão não encontrada"}
 
-    messages = []
-    for line in file_path.read_text().strip().split('\n'):
-        try:
-            messages.append(json.loads(line))
-        except:
-            pass
-
-    return {"count": len(messages), "messages": messages}
+    return StreamingResponse(_stream_session_messages(file_path), media_type="application/json")
 
 @app.delete("/sessions/{session_id}")
 async def delete_session(session_id: str):
     """Deleta uma sessão e sua pasta de outputs."""
-    import shutil
-
     file_path = SESSIONS_DIR / f"{session_id}.jsonl"
 
     if not file_path.exists():
@@ -441,12 +744,13 @@ async def delete_session(session_id: str):
     try:
         # Deletar arquivo da sessão
         file_path.unlink()
+        _SESSION_META_CACHE.pop(file_path.name, None)
 
         # Deletar pasta de outputs da sessão (se existir)
         outputs_dir = RAG_OUTPUTS_DIR / session_id
         if outputs_dir.exists() and outputs_dir.is_dir():
-            shutil.rmtree(outputs_dir)
-            print(f"🗑️ Pasta de outputs removida: {outputs_dir}")
+            await asyncio.to_thread(shutil.rmtree, outputs_dir)
+            log.info("session_outputs_removed", path=str(outputs_dir))
 
         # Deletar arquivos do AgentFS da sessão (se existirem)
         agentfs_dir = Path.home() / ".claude" / ".agentfs"
@@ -459,7 +763,7 @@ async def delete_session(session_id: str):
         for f in agentfs_files:
             if f.exists():
                 f.unlink()
-                print(f"🗑️ AgentFS removido: {f.name}")
+                log.info("agentfs_file_removed", file=f.name)
 
         return {"success": True}
     except Exception as e:
@@ -474,21 +778,58 @@ async def list_rag_outputs_by_session(session_id: str):
     if not session_dir.exists():
         return {"session_id": session_id, "files": [], "count": 0}
 
-    files = []
-    for file in session_dir.iterdir():
-        if file.is_file():
-            stat = file.stat()
-            files.append({
-                "name": file.name,
-                "path": str(file.relative_to(RAG_OUTPUTS_DIR)),
-                "size": stat.st_size,
-                "modified": stat.st_mtime * 1000
-            })
+    rel_dir = session_dir.relative_to(RAG_OUTPUTS_DIR)
+    files = [
+        {
+            "name": entry.name,
+            "path": str(rel_dir / entry.name),
+            "size": stat.st_size,
+            "modified": stat.st_mtime * 1000
+        }
+        for stat, entry in _scan_files(session_dir)
+    ]
 
-    files.sort(key=lambda f: f["modified"], reverse=True)
     return {"session_id": session_id, "files": files, "count": len(files)}
 
 
+# Preview dos outputs: tamanho fixo e extensões binárias nem são abertas
+PREVIEW_BYTES = 200
+BINARY_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".gif", ".pdf", ".zip", ".gz", ".mp4", ".db"})
+
+
+def _read_preview(path: str, name: str) -> str:
+    """Primeiros bytes do arquivo como texto, ou "[binary file]"."""
+    if os.path.splitext(name)[1].lower() in BINARY_EXTENSIONS:
+        return "[binary file]"
+
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read(PREVIEW_BYTES)
+    except OSError:
+        return "[binary file]"
+
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # Caractere multibyte cortado no fim do buffer não torna o arquivo binário
+        if e.reason == "unexpected end of data":
+            return raw[:e.start].decode('utf-8')
+        return "[binary file]"
+
+
+def _output_file_info(entry: os.DirEntry, rel_dir: Path) -> dict:
+    """Metadados e preview de um arquivo de output (roda em thread)."""
+    stat = entry.stat()
+    return {
+        "name": entry.name,
+        "path": str(rel_dir / entry.name),
+        "size": stat.st_size,
+        "modified": stat.st_mtime * 1000,
+        # Ler primeiras linhas para preview
+        "preview": _read_preview(entry.path, entry.name)
+    }
+
+
 @app.get("/sessions/{session_id}/rag-outputs")
 async def get_session_rag_outputs_detailed(session_id: str):
     """Retorna informação detalhada dos outputs RAG de uma sessão."""
@@ -503,29 +844,14 @@ async def get_session_rag_outputs_detailed(session_id: str):
             "count": 0
         }
 
-    files = []
-    total_size = 0
+    rel_dir = session_dir.relative_to(RAG_OUTPUTS_DIR)
 
-    for file in session_dir.iterdir():
-        if file.is_file():
-            stat = file.stat()
-            total_size += stat.st_size
+    with os.scandir(session_dir) as it:
+        entries = [entry for entry in it if entry.is_file(follow_symlinks=False)]
 
-            # Ler primeiras linhas para preview
-            preview = ""
-            try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    preview = f.read(200)
-            except:
-                preview = "[binary file]"
-
-            files.append({
-                "name": file.name,
-                "path": str(file.relative_to(RAG_OUTPUTS_DIR)),
-                "size": stat.st_size,
-                "modified": stat.st_mtime * 1000,
-                "preview": preview
-            })
+    # stat + preview de cada arquivo em paralelo
+    files = await _gather_in_threads(_output_file_info, entries, rel_dir)
+    total_size = sum(f["size"] for f in files)
 
     files.sort(key=lambda f: f["modified"], reverse=True)
 
@@ -547,7 +873,8 @@ async def delete_session_rag_outputs(session_id: str):
         return {"success": False, "error": "Sessão não encontrada"}
 
     try:
-        shutil.rmtree(session_dir)
+        # Remoção em thread: o event loop segue atendendo durante os unlinks
+        await asyncio.to_thread(shutil.rmtree, session_dir)
         return {"success": True, "message": f"Outputs da sessão {session_id} deletados"}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -572,17 +899,15 @@ async def list_outputs(session_id: Optional[str] = None):
     if not outputs_dir.exists():
         return {"files": [], "directory": str(outputs_dir), "session_id": session_id}
 
-    files = []
-    for file in outputs_dir.iterdir():
-        if file.is_file():
-            stat = file.stat()
-            files.append({
-                "name": file.name,
-                "size": stat.st_size,
-                "modified": stat.st_mtime * 1000
-            })
+    files = [
+        {
+            "name": entry.name,
+            "size": stat.st_size,
+            "modified": stat.st_mtime * 1000
+        }
+        for stat, entry in _scan_files(outputs_dir)
+    ]
 
-    files.sort(key=lambda f: f["modified"], reverse=True)
     return {"files": files, "directory": str(outputs_dir), "session_id": session_id}
 
 @app.get("/outputs/file/{filename}")
@@ -735,20 +1060,20 @@ async def list_audit_sessions():
         return {"sessions": [], "count": 0}
 
     sessions = []
-    for file in sorted(AUDIT_DIR.glob("*.jsonl"), key=lambda f: f.stat().st_mtime, reverse=True):
+    for stat, entry in _scan_files(AUDIT_DIR, ".jsonl"):
         try:
             # Contar linhas (tool calls)
-            with open(file, 'r') as f:
+            with open(entry.path, 'r') as f:
                 lines = [l for l in f if l.strip()]
 
             sessions.append({
-                "session_id": file.stem,
+                "session_id": entry.name[:-len(".jsonl")],
                 "tool_calls": len(lines),
-                "file_size": file.stat().st_size,
-                "modified": file.stat().st_mtime * 1000
+                "file_size": stat.st_size,
+                "modified": stat.st_mtime * 1000
             })
         except Exception as e:
-            print(f"Erro ao ler audit file {file}: {e}")
+            log.warning("audit_file_read_failed", file=entry.path, error=str(e))
 
     return {
         "sessions": sessions,
@@ -774,4 +1099,20 @@ async def get_audit_dashboard():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+
+    # uvloop (event loop sobre libuv) e httptools (parser HTTP em C) quando
+    # instalados; senão asyncio + h11. Um único worker: o cliente Claude,
+    # os caches e os limites de concorrência vivem neste processo
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+
+    uvicorn.run(app, host="0.0.0.0", port=8001, loop=loop, http=http)
@@ -2,8 +2,14 @@
 """Script para adicionar documentos de meta-documentação ao banco."""
 
 import sqlite3
+import sys
 from pathlib import Path
 
+# Adicionar rag-agent ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "rag-agent"))
+
+from core.config import bump_data_version
+
 # Paths
 db_path = Path(__file__).parent / "documentos.db"
 meta_docs_dir = Path(__file__).parent / "meta_docs"
@@ -34,6 +40,9 @@ for doc_file in sorted(meta_docs_dir.glob("*.md")):
 
     docs_added += 1
 
+# Incrementar versão dos dados (invalida caches de leitura do MCP server)
+bump_data_version(cursor)
+
 conn.commit()
 conn.close()
 